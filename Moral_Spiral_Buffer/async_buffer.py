@@ -0,0 +1,242 @@
+"""
+Async Spiral Buffer - asyncio front-end for SpiralBuffer
+
+Producers await a bounded ingest queue instead of running the buffer's
+maintenance inline: an ingest task appends events (phase index, eviction
+heap and resonance only), and a maintenance task runs the coherence monitor,
+cycle-end reinforcement and history tracking on a schedule set by the
+buffer's update frequency.
+"""
+
+import asyncio
+from typing import List, Dict, Any, Optional
+
+from spiral_buffer import SpiralBuffer, MemoryEvent
+
+
+class DeferredSpiralBuffer(SpiralBuffer):
+    """
+    SpiralBuffer whose inserts leave maintenance for maintain()
+    
+    add_event and add_events store the event, update the indexes and evict
+    over capacity as usual, but only record what maintenance is due:
+    completed cycles to reinforce, phase regions for the coherence monitor
+    to inspect, and that the coherence/entropy history needs a new entry.
+    """
+    
+    INSTRUMENTED_METHODS = SpiralBuffer.INSTRUMENTED_METHODS + ('maintain',)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._due_cycles: List[float] = []
+        self._due_regions: Dict[int, float] = {}
+        self._metrics_due = False
+    
+    @property
+    def maintenance_due(self) -> bool:
+        """Whether maintain() has deferred work to do"""
+        return bool(self._due_cycles or self._due_regions or self._metrics_due)
+    
+    def maintain(self):
+        """
+        Run deferred maintenance
+        
+        Reinforces each completed cycle in order at the phase where it ended,
+        appends one history entry for the ten most recent events, and runs
+        the coherence monitor once per phase region touched since the last
+        pass, at the last phase reached inside it.
+        """
+        cycles, self._due_cycles = self._due_cycles, []
+        for phase in cycles:
+            super()._reinforce_coherent_memories(phase)
+        
+        if self._metrics_due:
+            self._metrics_due = False
+            super()._update_metrics(None)
+        
+        regions, self._due_regions = self._due_regions, {}
+        for phase in regions.values():
+            super()._check_coherence(phase)
+        self._journal_commit()
+    
+    # Deferred maintenance steps
+    
+    def _reinforce_coherent_memories(self, phase: float = None):
+        self._due_cycles.append(self.current_phase if phase is None else phase)
+    
+    def _update_metrics(self, new_event: MemoryEvent):
+        if len(self._store):
+            self._metrics_due = True
+    
+    def _check_coherence(self, phase: float):
+        region = int(phase // self.monitor.DETECTION_RADIUS)
+        self._due_regions.pop(region, None)
+        self._due_regions[region] = phase
+
+
+class AsyncSpiralBuffer:
+    """
+    asyncio front-end for a DeferredSpiralBuffer
+    
+    add() awaits room in a bounded queue, which is the producers'
+    backpressure; an ingest task drains it in batches into the buffer, and a
+    maintenance task runs DeferredSpiralBuffer.maintain() every
+    `maintenance_interval` seconds (by default one phase step, 1 /
+    update_frequency) whenever work is due. Everything runs on the event
+    loop's thread, so no locking is needed; reads see events ingested so far
+    and the maintenance state as of the last pass.
+    
+    Use as `async with AsyncSpiralBuffer(...) as buffer:` or call start()
+    and stop().
+    """
+    
+    def __init__(self,
+                 queue_size: int = 1024,
+                 max_batch: int = 256,
+                 maintenance_interval: float = None,
+                 **buffer_kwargs):
+        """
+        Args:
+            queue_size: Ingest queue bound; add() waits while it is full
+            max_batch: Most queued events ingested before yielding to the loop
+            maintenance_interval: Seconds between maintenance passes (defaults
+                to 1 / update_frequency)
+            **buffer_kwargs: SpiralBuffer arguments
+        """
+        self.buffer = DeferredSpiralBuffer(**buffer_kwargs)
+        self.queue_size = queue_size
+        self.max_batch = max(1, max_batch)
+        self.maintenance_interval = maintenance_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._error: Optional[BaseException] = None
+    
+    async def __aenter__(self) -> 'AsyncSpiralBuffer':
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    async def start(self):
+        """Start the ingest and maintenance tasks on the running loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._ingest_loop()),
+            asyncio.create_task(self._maintenance_loop()),
+        ]
+    
+    async def stop(self):
+        """Ingest everything queued, run a final maintenance pass and stop the tasks"""
+        if not self._tasks:
+            return
+        try:
+            await self.drain()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+    
+    async def add(self, content: Any, coherence: float, entropy: float):
+        """
+        Queue a new memory event, waiting while the ingest queue is full
+        
+        Args:
+            content: The data/information to store
+            coherence: Score (0-1) for how much this promotes order/beneficial outcomes
+            entropy: Score (0-1) for how much this introduces disorder/harmful effects
+        
+        Raises:
+            RuntimeError: If the buffer has not been started
+        """
+        self._raise_error()
+        self._require_started()
+        await self._queue.put((content, coherence, entropy))
+    
+    def add_nowait(self, content: Any, coherence: float, entropy: float):
+        """Queue a new memory event; raises asyncio.QueueFull when the queue is full"""
+        self._raise_error()
+        self._require_started()
+        self._queue.put_nowait((content, coherence, entropy))
+    
+    async def drain(self):
+        """Wait until every queued event is ingested, then run due maintenance"""
+        self._require_started()
+        await self._queue.join()
+        self._raise_error()
+        if self.buffer.maintenance_due:
+            self.buffer.maintain()
+    
+    async def recall(self, target_coherence: float, top_k: int = 5,
+                     epsilon: float = 0.0) -> List[MemoryEvent]:
+        """
+        Retrieve memories using coherence-based harmonic recall
+        
+        Args:
+            target_coherence: Desired coherence level (0-1)
+            top_k: Number of memories to retrieve
+            epsilon: Recall score tolerance (see SpiralBuffer.recall_by_coherence)
+        
+        Returns:
+            List of memories ranked by relevance and moral value
+        """
+        return self.buffer.recall_by_coherence(target_coherence, top_k, epsilon)
+    
+    async def recall_similar(self, query: Any, top_k: int = 5, n_probe: int = None) -> List[MemoryEvent]:
+        """Retrieve memories whose content is like the query (see SpiralBuffer.recall_similar)"""
+        return self.buffer.recall_similar(query, top_k, n_probe)
+    
+    async def get_phase_neighbors(self, phase: float, radius: float) -> List[MemoryEvent]:
+        """Get events within specified phase radius"""
+        return self.buffer.get_phase_neighbors(phase, radius)
+    
+    async def get_system_metrics(self) -> Dict:
+        """Get comprehensive system performance metrics"""
+        metrics = self.buffer.get_system_metrics()
+        metrics['queued_events'] = self._queue.qsize() if self._queue is not None else 0
+        return metrics
+    
+    # Background tasks
+    
+    async def _ingest_loop(self):
+        """Move queued events into the buffer, a batch at a time"""
+        queue = self._queue
+        while True:
+            items = [await queue.get()]
+            while len(items) < self.max_batch and not queue.empty():
+                items.append(queue.get_nowait())
+            
+            try:
+                for content, coherence, entropy in items:
+                    self.buffer.add_event(content, coherence, entropy)
+            except Exception as exc:
+                self._error = exc
+            finally:
+                for _ in items:
+                    queue.task_done()
+            await asyncio.sleep(0)
+    
+    async def _maintenance_loop(self):
+        """Run deferred maintenance on a schedule driven by update_frequency"""
+        while True:
+            interval = self.maintenance_interval or 1.0 / self.buffer.update_frequency
+            await asyncio.sleep(interval)
+            if self.buffer.maintenance_due:
+                try:
+                    self.buffer.maintain()
+                except Exception as exc:
+                    self._error = exc
+    
+    def _require_started(self):
+        """Refuse queue operations while no ingest task is running"""
+        if not self._tasks:
+            raise RuntimeError("start() the buffer first")
+    
+    def _raise_error(self):
+        """Re-raise a failure from a background task"""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -0,0 +1,131 @@
+"""
+Memory Benchmark
+
+Measures bytes per stored event for the original dataclass-per-event
+layout and for SpiralBuffer's columnar store, with content held as live
+objects or packed into a ContentStore.
+"""
+
+import gc
+import math
+import tracemalloc
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Callable, List
+from spiral_buffer import SpiralBuffer
+
+
+@dataclass
+class ScoredComment:
+    """Stand-in for the Reddit analyzer's comment record"""
+    text: str
+    author: str
+    score: int
+    coherence: float
+    entropy: float
+    moral_value: float
+    url: str = ""
+
+
+@dataclass
+class DataclassMemoryEvent:
+    """The original MemoryEvent layout: one dataclass instance per event"""
+    content: Any
+    timestamp: float
+    phase: float
+    coherence_score: float = 0.0
+    entropy_score: float = 0.0
+    moral_value: float = 0.0
+    access_count: int = 0
+    last_accessed: float = 0.0
+    harmonic_resonance: float = 0.0
+
+
+WORDS = ("thanks", "source", "agree", "evidence", "however", "interesting",
+         "wrong", "study", "people", "actually", "think", "data", "because")
+
+
+def make_comments(count: int, seed: int = 0) -> List[ScoredComment]:
+    """Synthetic comments with Reddit-like text lengths"""
+    rng = np.random.default_rng(seed)
+    comments = []
+    for i in range(count):
+        words = rng.choice(WORDS, size=int(rng.integers(5, 60)))
+        coherence, entropy = float(rng.random()), float(rng.random())
+        comments.append(ScoredComment(
+            text=" ".join(words),
+            author=f"user_{int(rng.integers(100000))}",
+            score=int(rng.integers(-50, 5000)),
+            coherence=coherence,
+            entropy=entropy,
+            moral_value=coherence - entropy,
+            url=f"https://reddit.com/r/sample/comments/{i:x}"
+        ))
+    return comments
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by whatever build()'s result keeps alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def build_dataclass_events(contents: List[Any], coherences: np.ndarray, entropies: np.ndarray) -> list:
+    """The original buffer's list of dataclass events"""
+    phase_increment = 2 * math.pi / SpiralBuffer.OPTIMAL_FREQUENCY
+    return [
+        DataclassMemoryEvent(
+            content=content,
+            timestamp=1.7e9 + i,
+            phase=(i * phase_increment) % (2 * math.pi),
+            coherence_score=float(coherence),
+            entropy_score=float(entropy),
+            moral_value=float(coherence - entropy)
+        )
+        for i, (content, coherence, entropy) in enumerate(zip(contents, coherences, entropies))
+    ]
+
+
+def build_spiral_buffer(contents: List[Any], coherences: np.ndarray, entropies: np.ndarray,
+                        compact_content: bool, batch_size: int = 1000) -> SpiralBuffer:
+    """A full SpiralBuffer holding every event (store, indexes and content)"""
+    buffer = SpiralBuffer(max_capacity=len(contents), compact_content=compact_content)
+    for start in range(0, len(contents), batch_size):
+        end = start + batch_size
+        buffer.add_events(contents[start:end], coherences[start:end], entropies[start:end])
+    return buffer
+
+
+def run_memory_benchmark(event_count: int = 100000):
+    """Print bytes per event for each layout, with and without content"""
+    rng = np.random.default_rng(42)
+    coherences, entropies = rng.random(event_count), rng.random(event_count)
+    
+    print(f"Memory per event ({event_count:,} events, tracemalloc)")
+    print(f"{'Layout':<40} {'Content':>10} {'Bytes/event':>12}")
+    print("-" * 64)
+    
+    for label, make_contents in (("none", lambda: [None] * event_count),
+                                 ("comment", lambda: make_comments(event_count))):
+        layouts = (
+            ("dataclass events (before)",
+             lambda: build_dataclass_events(make_contents(), coherences, entropies)),
+            ("SpiralBuffer, object content",
+             lambda: build_spiral_buffer(make_contents(), coherences, entropies, False)),
+            ("SpiralBuffer, compact_content=True",
+             lambda: build_spiral_buffer(make_contents(), coherences, entropies, True)),
+        )
+        for name, build in layouts:
+            bytes_used = measure(build)
+            print(f"{name:<40} {label:>10} {bytes_used / event_count:>12.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    run_memory_benchmark()
@@ -0,0 +1,69 @@
+"""
+Recall Benchmark
+
+Measures recall_by_coherence latency for exact and approximate recall
+(epsilon > 0) on large buffers, with and without the recall index, and the
+accuracy of each approximate setting as recall@k: the share of the exact
+top-k that it also returns.
+"""
+
+import time
+import numpy as np
+from typing import List
+from spiral_buffer import SpiralBuffer
+
+
+EPSILONS = (0.0, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2)
+
+
+def build_buffer(event_count: int, recall_index: bool = True, seed: int = 0, batch_size: int = 10000) -> SpiralBuffer:
+    """A full buffer of `event_count` events with integer content, without the recall cache"""
+    rng = np.random.default_rng(seed)
+    # Timed queries repeat the targets recall_ids just ran, so a cache would serve them
+    buffer = SpiralBuffer(max_capacity=event_count, recall_index=recall_index, recall_cache_size=0)
+    for start in range(0, event_count, batch_size):
+        count = min(batch_size, event_count - start)
+        buffer.add_events(list(range(start, start + count)), rng.random(count), rng.random(count) * 0.5)
+    return buffer
+
+
+def recall_ids(buffer: SpiralBuffer, targets: np.ndarray, top_k: int, epsilon: float) -> List[set]:
+    """Content of each query's recalled events"""
+    return [{event.content for event in buffer.recall_by_coherence(float(target), top_k, epsilon)}
+            for target in targets]
+
+
+def time_recall(buffer: SpiralBuffer, targets: np.ndarray, top_k: int, epsilon: float) -> float:
+    """Mean recall latency in microseconds"""
+    start = time.perf_counter()
+    for target in targets:
+        buffer.recall_by_coherence(float(target), top_k, epsilon)
+    return (time.perf_counter() - start) / len(targets) * 1e6
+
+
+def run_recall_benchmark(event_counts=(10000, 100000, 1000000), top_k: int = 10, queries: int = 200):
+    """Print latency and recall@k of each epsilon for each buffer size"""
+    targets = np.random.default_rng(42).random(queries)
+    
+    print(f"Recall latency and recall@{top_k} ({queries} queries per setting)")
+    print(f"{'Events':>10} {'Index':>6} {'epsilon':>8} {'Latency (us)':>13} {'Speedup':>8} {f'Recall@{top_k}':>10}")
+    print("-" * 60)
+    
+    for event_count in event_counts:
+        for recall_index in (True, False):
+            buffer = build_buffer(event_count, recall_index)
+            exact = recall_ids(buffer, targets, top_k, 0.0)
+            exact_latency = time_recall(buffer, targets, top_k, 0.0)
+            
+            for epsilon in EPSILONS:
+                approximate = recall_ids(buffer, targets, top_k, epsilon)
+                latency = exact_latency if epsilon == 0.0 else time_recall(buffer, targets, top_k, epsilon)
+                recall_at_k = np.mean([len(found & wanted) / max(len(wanted), 1)
+                                       for found, wanted in zip(approximate, exact)])
+                print(f"{event_count:>10,} {'on' if recall_index else 'off':>6} {epsilon:>8.3f} {latency:>13.1f} "
+                      f"{exact_latency / latency:>7.2f}x {recall_at_k:>10.3f}")
+            print()
+
+
+if __name__ == "__main__":
+    run_recall_benchmark()
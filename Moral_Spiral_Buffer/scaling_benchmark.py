@@ -0,0 +1,155 @@
+"""
+Scaling Benchmark
+
+Measures SpiralBuffer throughput, latency and memory from 1e3 to 1e6
+events: burst add (batches filling the buffer), steady-state
+add (add_event into a full buffer), recall, phase-neighbor queries,
+get_system_metrics and auto-tuning. Each capacity runs in its own
+subprocess so its peak RSS is its own, every workload draws from a fixed
+seed, and the results are printed (or written) as JSON for comparison
+across commits, including trees that predate add_events.
+
+    python scaling_benchmark.py --output baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from typing import Callable, Dict, List
+from spiral_buffer import SpiralBuffer
+
+
+CAPACITIES = (1000, 10000, 100000, 1000000)
+SEED = 1234
+
+# Events per burst, shrunk so every fill is at least MIN_BURSTS bursts
+BURST_SIZE = 1000
+MIN_BURSTS = 100
+
+
+def summarize(latencies_ns: List[int], events: int = None) -> Dict:
+    """ops/s (events/s when given the events handled), p50/p99/max latency in microseconds"""
+    latencies = np.asarray(latencies_ns, dtype=np.float64)
+    total = latencies.sum()
+    return {
+        'ops': len(latencies),
+        'ops_per_s': (events or len(latencies)) / (total / 1e9) if total else 0.0,
+        'p50_us': float(np.percentile(latencies, 50)) / 1e3,
+        'p99_us': float(np.percentile(latencies, 99)) / 1e3,
+        'max_us': float(latencies.max()) / 1e3,
+    }
+
+
+def time_each(operation: Callable[[int], object], count: int) -> List[int]:
+    """Latency in nanoseconds of operation(i) for i in range(count)"""
+    clock = time.perf_counter_ns
+    latencies = []
+    for i in range(count):
+        start = clock()
+        operation(i)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def add_burst(buffer: SpiralBuffer, contents: list, coherences: np.ndarray, entropies: np.ndarray):
+    """add_events, or an add_event loop on trees without it"""
+    if hasattr(buffer, 'add_events'):
+        buffer.add_events(contents, coherences, entropies)
+    else:
+        for content, coherence, entropy in zip(contents, coherences, entropies):
+            buffer.add_event(content, float(coherence), float(entropy))
+
+
+def run_capacity(capacity: int, seed: int = SEED) -> Dict:
+    """Every workload at one capacity, in this process"""
+    rng = np.random.default_rng(seed)
+    
+    # Coherence threshold above 1 makes every auto-tune call run its sweep
+    buffer = SpiralBuffer(max_capacity=capacity, coherence_threshold=1.01)
+    results = {'capacity': capacity}
+    
+    # Burst add: fill the buffer in batches
+    coherences, entropies = rng.random(capacity), rng.random(capacity) * 0.6
+    burst_size = max(1, min(BURST_SIZE, capacity // MIN_BURSTS))
+    batches = [(start, min(start + burst_size, capacity)) for start in range(0, capacity, burst_size)]
+    results['burst_add'] = summarize(time_each(
+        lambda i: add_burst(buffer, list(range(*batches[i])),
+                            coherences[slice(*batches[i])], entropies[slice(*batches[i])]),
+        len(batches)), capacity)
+    results['burst_add']['burst_size'] = burst_size
+    
+    # Steady-state add: single inserts into the full buffer, each evicting
+    count = min(capacity, 10000)
+    coherences, entropies = rng.random(count), rng.random(count) * 0.6
+    results['steady_add'] = summarize(time_each(
+        lambda i: buffer.add_event(capacity + i, coherences[i], entropies[i]), count))
+    
+    # Distinct targets, so recall ranks rather than hitting the recall cache
+    targets = rng.random(500)
+    results['recall'] = summarize(time_each(
+        lambda i: buffer.recall_by_coherence(targets[i], 10), len(targets)))
+    
+    phases = rng.random(500) * 2 * np.pi
+    results['neighbors'] = summarize(time_each(
+        lambda i: buffer.get_phase_neighbors(phases[i], 0.05), len(phases)))
+    
+    results['metrics'] = summarize(time_each(lambda i: buffer.get_system_metrics(), 200))
+    
+    results['auto_tune'] = summarize(time_each(lambda i: buffer.auto_tune_frequency(), 5))
+    
+    results['events'] = len(buffer.events)
+    results['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    return results
+
+
+def git_commit() -> str:
+    """Commit the benchmarked tree is at, if known"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scaling_benchmark(capacities=CAPACITIES, seed: int = SEED) -> Dict:
+    """Run each capacity in a fresh subprocess and collect the results"""
+    report = {
+        'benchmark': 'spiral_buffer_scaling',
+        'seed': seed,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': [],
+    }
+    for capacity in capacities:
+        print(f"capacity {capacity:,}...", file=sys.stderr)
+        worker = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(capacity),
+                                 '--seed', str(seed)], capture_output=True, text=True, check=True)
+        report['results'].append(json.loads(worker.stdout))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--capacities', type=int, nargs='+', default=list(CAPACITIES))
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker is not None:
+        print(json.dumps(run_capacity(args.worker, args.seed)))
+    else:
+        report = json.dumps(run_scaling_benchmark(args.capacities, args.seed), indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(report + '\n')
+        else:
+            print(report)
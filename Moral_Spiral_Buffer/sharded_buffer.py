@@ -0,0 +1,473 @@
+"""
+Sharded Spiral Buffer - Multi-process SpiralBuffer with scatter-gather recall
+
+Spreads events across worker processes, each running its own SpiralBuffer,
+so ingest and recall use every core. A coordinator in the calling process
+owns the global phase clock and insertion order, enforces capacity across
+all shards by moral value, and merges per-shard results.
+"""
+
+import numpy as np
+import heapq
+import math
+import multiprocessing
+import os
+import pickle
+import time
+import zlib
+from typing import List, Dict, Tuple, Any
+from collections import deque
+
+from spiral_buffer import SpiralBuffer, MemoryEvent
+
+
+def _event_record(store, row: int) -> Tuple:
+    """Picklable field tuple for a stored event (see _event_copy)"""
+    return (store.content[row], float(store.timestamp[row]), float(store.phase[row]),
+            float(store.coherence_score[row]), float(store.entropy_score[row]),
+            int(store.access_count[row]), float(store.last_accessed[row]),
+            store.resonance(row))
+
+
+def _event_copy(record: Tuple) -> MemoryEvent:
+    """Standalone MemoryEvent rebuilt from an _event_record tuple"""
+    content, timestamp, phase, coherence, entropy, access_count, last_accessed, resonance = record
+    return MemoryEvent(
+        content=content,
+        timestamp=timestamp,
+        phase=phase,
+        coherence_score=coherence,
+        entropy_score=entropy,
+        access_count=access_count,
+        last_accessed=last_accessed,
+        harmonic_resonance=resonance
+    )
+
+
+class _Shard:
+    """One worker's SpiralBuffer, driven by coordinator commands"""
+    
+    def __init__(self, config: Dict):
+        self.buffer = SpiralBuffer(**config)
+    
+    def apply(self, commands: List[Tuple]):
+        """Replay a batch of inserts, coherence checks and cycle-end reinforcements in order"""
+        buffer = self.buffer
+        store = buffer._store
+        for command in commands:
+            if command[0] == 'add':
+                _, content, coherence, entropy, phase, seq = command
+                if not store._free and store.high_water == store.capacity:
+                    store.grow(2 * store.capacity)
+                buffer.current_phase = phase
+                store._next_seq = seq  # Shard rows carry global insertion numbers
+                buffer._store_event(content, coherence, entropy)
+            elif command[0] == 'check':
+                buffer._check_coherence(command[1])
+            else:
+                buffer._reinforce_coherent_memories(command[1])
+    
+    def lowest(self, count: int) -> List[Tuple[float, int]]:
+        """(moral value, seq) of the `count` lowest-value events, lowest first"""
+        store = self.buffer._store
+        heap = self.buffer._eviction_heap
+        
+        # Pending boosts only raise moral value, so heap keys are lower bounds:
+        # settle the candidates until the lowest keys are all current
+        rows = np.asarray(heap.smallest(count), dtype=np.int64)
+        while (store.applied_epoch[rows] != store.epoch).any():
+            store.settle_rows(rows)
+            rows = np.asarray(heap.smallest(count), dtype=np.int64)
+        return list(zip(store.moral_value[rows].tolist(), store.seq[rows].tolist()))
+    
+    def evict(self, count: int):
+        """Evict the `count` lowest-value events"""
+        for _ in range(count):
+            self.buffer._evict_lowest()
+    
+    def recall(self, target_coherence: float, top_k: int, phase: float,
+               epsilon: float = 0.0) -> List[Tuple]:
+        """This shard's recall candidates as (score, seq, row, record), best first"""
+        buffer = self.buffer
+        store = buffer._store
+        buffer.current_phase = phase
+        
+        # Score with the target the shard ranked by, so merged scores match its order
+        target_coherence = buffer._recall_target(target_coherence)
+        rows = buffer._recall_rows(target_coherence, top_k, epsilon)
+        scores = buffer._recall_scores(rows, target_coherence)
+        return [(score, int(store.seq[row]), row, _event_record(store, row))
+                for score, row in zip(scores.tolist(), rows.tolist())]
+    
+    def access(self, rows: List[int], accessed_at: float):
+        """Record recall access for rows chosen by the coordinator"""
+        store = self.buffer._store
+        store.access_count[rows] += 1
+        store.last_accessed[rows] = accessed_at
+    
+    def neighbors(self, phase: float, radius: float) -> List[Tuple[int, Tuple]]:
+        """(seq, record) of events within the phase radius"""
+        store = self.buffer._store
+        rows = self.buffer._phase_neighbor_rows(phase, radius)
+        return [(int(store.seq[row]), _event_record(store, row)) for row in rows.tolist()]
+    
+    def partials(self) -> Dict:
+        """Partial aggregates for combining system metrics"""
+        buffer = self.buffer
+        buffer._settle_all()
+        aggregates = buffer._aggregates
+        aggregates.means()  # Applies any due periodic recompute
+        return {
+            'count': aggregates.count,
+            'moral_sum': aggregates.moral_sum,
+            'coherence_sum': aggregates.coherence_sum,
+            'entropy_sum': aggregates.entropy_sum,
+            'high_value_count': aggregates.high_value_count,
+            'interventions': len(buffer.monitor.interventions),
+        }
+
+
+def _run_shard(connection, config: Dict):
+    """Worker process loop: apply commands until told to stop"""
+    shard = _Shard(config)
+    error = None
+    while True:
+        command, reply, args = connection.recv()
+        if command == 'stop':
+            connection.send((error, None))
+            return
+        
+        result = None
+        if error is None:
+            try:
+                result = getattr(shard, command)(*args)
+            except Exception as exc:
+                error = exc
+        
+        # Failures in fire-and-forget commands surface at the next reply
+        if reply:
+            connection.send((error, result))
+            error = None
+
+
+class ShardedSpiralBuffer:
+    """
+    SpiralBuffer spread across worker processes
+    
+    Events are assigned to shards by phase sector ('phase') or by a hash of
+    their content ('hash'). The coordinator advances the global phase and
+    insertion sequence exactly as a single buffer would and queues inserts,
+    coherence checks and cycle-end reinforcements per shard, shipping them
+    in batches of `batch_size` that workers apply in parallel.
+    
+    Differences from a single SpiralBuffer:
+    
+    - Capacity is enforced once per batch, as in SpiralBuffer.add_events:
+      the globally lowest (moral value, insertion order) events are evicted
+      from whichever shards hold them.
+    - Harmonic resonance and the coherence monitor see only the events in
+      the same shard (with 'phase' partitioning, the monitor's region is
+      shard-local except at sector edges).
+    - Moral momentum and stability use the incoming scores of the last ten
+      events rather than their stored scores.
+    - Returned events are standalone copies; add_event returns None, since
+      the event lives in a worker process.
+    
+    Each shard preallocates its share of max_capacity plus one batch and
+    doubles its columns whenever it fills, so memory follows the events a
+    shard actually holds rather than n_shards times the global capacity.
+    """
+    
+    PARTITIONS = ('phase', 'hash')
+    
+    def __init__(self,
+                 n_shards: int = None,
+                 max_capacity: int = 1000,
+                 partition: str = 'phase',
+                 batch_size: int = 1024,
+                 **buffer_kwargs):
+        """
+        Start the shard workers
+        
+        Args:
+            n_shards: Number of worker processes (defaults to the CPU count)
+            max_capacity: Maximum number of events across all shards
+            partition: 'phase' to shard by phase sector, 'hash' by content
+            batch_size: Inserts queued before they are shipped to the workers
+            **buffer_kwargs: Further SpiralBuffer arguments for every shard
+        """
+        if partition not in self.PARTITIONS:
+            raise ValueError(f"partition must be one of {self.PARTITIONS}")
+        for option in ('deduplicate', 'ttl', 'embedding_dim'):
+            if buffer_kwargs.get(option):
+                raise ValueError(f"ShardedSpiralBuffer does not support {option}")
+        self.n_shards = n_shards or os.cpu_count() or 1
+        self.max_capacity = max_capacity
+        self.partition = partition
+        self.batch_size = max(1, batch_size)
+        
+        # Global phase clock, mirroring SpiralBuffer
+        self.update_frequency = buffer_kwargs.get('update_frequency') or SpiralBuffer.OPTIMAL_FREQUENCY
+        self.current_phase = 0.0
+        self.cycle_count = 0
+        self.coherence_history = deque(maxlen=100)
+        self.entropy_history = deque(maxlen=100)
+        self.moral_momentum = 0.0
+        self._recent_scores = deque(maxlen=10)
+        
+        self._next_seq = 0
+        self._sizes = [0] * self.n_shards
+        self._pending = [[] for _ in range(self.n_shards)]
+        self._pending_count = 0
+        
+        # Shards start at their share of capacity plus one batch, and grow
+        # when moral value concentrates events in fewer of them
+        config = dict(buffer_kwargs, max_capacity=-(-max_capacity // self.n_shards) + self.batch_size)
+        self._connections = []
+        self._processes = []
+        for _ in range(self.n_shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_shard, args=(child, config), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+    
+    def __len__(self) -> int:
+        self._sync()
+        return sum(self._sizes)
+    
+    def __enter__(self) -> 'ShardedSpiralBuffer':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Stop the shard workers"""
+        errors = []
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(('stop', True, ()))
+                error, _ = connection.recv()
+                if error is not None:
+                    errors.append(error)
+            except (EOFError, OSError):
+                pass
+            connection.close()
+            process.join()
+        self._connections, self._processes = [], []
+        if errors:
+            raise errors[0]
+    
+    def add_event(self, content: Any, coherence: float, entropy: float):
+        """
+        Queue a new memory event for its shard
+        
+        Args:
+            content: The data/information to store
+            coherence: Score (0-1) for how much this promotes order/beneficial outcomes
+            entropy: Score (0-1) for how much this introduces disorder/harmful effects
+        """
+        shard = self._shard_for(content, self.current_phase)
+        self._pending[shard].append(('add', content, coherence, entropy, self.current_phase, self._next_seq))
+        self._next_seq += 1
+        self._pending_count += 1
+        
+        self._recent_scores.append((coherence, entropy))
+        self._advance_phase()
+        self._update_metrics()
+        
+        # As in SpiralBuffer.add_event, the event's shard checks coherence at
+        # the advanced phase, after any cycle-end reinforcement it queued
+        self._pending[shard].append(('check', self.current_phase))
+        
+        if self._pending_count >= self.batch_size:
+            self._sync(trim=False)
+    
+    def add_events(self,
+                   contents: List[Any],
+                   coherences: List[float],
+                   entropies: List[float]):
+        """
+        Queue a burst of events
+        
+        Args:
+            contents: The data/information to store, one item per event
+            coherences: Coherence score (0-1) for each event
+            entropies: Entropy score (0-1) for each event
+        """
+        if not (len(contents) == len(coherences) == len(entropies)):
+            raise ValueError("contents, coherences and entropies must have equal length")
+        for content, coherence, entropy in zip(contents, coherences, entropies):
+            self.add_event(content, float(coherence), float(entropy))
+    
+    def recall_by_coherence(self,
+                           target_coherence: float,
+                           top_k: int = 5,
+                           epsilon: float = 0.0) -> List[MemoryEvent]:
+        """
+        Retrieve memories using coherence-based harmonic recall across all shards
+        
+        Args:
+            target_coherence: Desired coherence level (0-1)
+            top_k: Number of memories to retrieve
+            epsilon: Recall score tolerance passed to every shard (see
+                SpiralBuffer.recall_by_coherence); 0 is exact
+        
+        Returns:
+            Copies of the recalled memories, ranked by relevance and moral value
+        """
+        self._sync()
+        replies = self._scatter('recall', target_coherence, top_k, self.current_phase, epsilon)
+        candidates = [(-score, seq, shard, row, record)
+                      for shard, shard_candidates in enumerate(replies)
+                      for score, seq, row, record in shard_candidates]
+        best = heapq.nsmallest(max(0, top_k), candidates)
+        
+        accessed_at = time.time()
+        rows_by_shard: Dict[int, List[int]] = {}
+        for _, _, shard, row, _ in best:
+            rows_by_shard.setdefault(shard, []).append(row)
+        for shard, rows in rows_by_shard.items():
+            self._send(shard, 'access', rows, accessed_at)
+        
+        events = []
+        for _, _, _, _, record in best:
+            event = _event_copy(record)
+            event.access_count += 1
+            event.last_accessed = accessed_at
+            events.append(event)
+        return events
+    
+    def get_phase_neighbors(self, phase: float, radius: float) -> List[MemoryEvent]:
+        """Get copies of events within specified phase radius, oldest first"""
+        self._sync()
+        neighbors = [neighbor for shard_neighbors in self._scatter('neighbors', phase, radius)
+                     for neighbor in shard_neighbors]
+        neighbors.sort(key=lambda neighbor: neighbor[0])
+        return [_event_copy(record) for _, record in neighbors]
+    
+    def get_system_metrics(self) -> Dict:
+        """Get system performance metrics combined from every shard"""
+        self._sync()
+        partials = self._scatter('partials')
+        count = sum(partial['count'] for partial in partials)
+        if not count:
+            return {'status': 'empty'}
+        
+        avg_moral_value = sum(partial['moral_sum'] for partial in partials) / count
+        return {
+            'total_events': count,
+            'current_phase': self.current_phase,
+            'update_frequency': self.update_frequency,
+            'cycle_count': self.cycle_count,
+            'avg_moral_value': avg_moral_value,
+            'avg_coherence': sum(partial['coherence_sum'] for partial in partials) / count,
+            'avg_entropy': sum(partial['entropy_sum'] for partial in partials) / count,
+            'moral_momentum': self.moral_momentum,
+            'coherence_interventions': sum(partial['interventions'] for partial in partials),
+            'high_value_events': sum(partial['high_value_count'] for partial in partials),
+            'shard_sizes': list(self._sizes),
+            'stability_score': self._calculate_stability_score(avg_moral_value)
+        }
+    
+    # Private helper methods
+    
+    def _shard_for(self, content: Any, phase: float) -> int:
+        """Shard an event is assigned to"""
+        if self.partition == 'phase':
+            return int(phase / (2 * math.pi) * self.n_shards) % self.n_shards
+        return zlib.crc32(pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)) % self.n_shards
+    
+    def _advance_phase(self):
+        """Advance the global phase, queueing reinforcement on every shard at cycle end"""
+        phase_increment = (2 * math.pi) / self.update_frequency
+        self.current_phase = (self.current_phase + phase_increment) % (2 * math.pi)
+        
+        if self.current_phase < phase_increment:
+            self.cycle_count += 1
+            for pending in self._pending:
+                pending.append(('reinforce', self.current_phase))
+    
+    def _update_metrics(self):
+        """Track coherence/entropy of the last ten incoming events"""
+        count = len(self._recent_scores)
+        avg_coherence = sum(coherence for coherence, _ in self._recent_scores) / count
+        avg_entropy = sum(entropy for _, entropy in self._recent_scores) / count
+        self.coherence_history.append(avg_coherence)
+        self.entropy_history.append(avg_entropy)
+        
+        if len(self.coherence_history) >= 2:
+            coherence_trend = self.coherence_history[-1] - self.coherence_history[-2]
+            entropy_trend = self.entropy_history[-1] - self.entropy_history[-2]
+            self.moral_momentum = coherence_trend - entropy_trend
+    
+    def _calculate_stability_score(self, moral_value_avg: float) -> float:
+        """Calculate overall system stability metric (as SpiralBuffer does)"""
+        if len(self.coherence_history) < 5:
+            return 0.5
+        
+        recent_coherence = list(self.coherence_history)[-5:]
+        recent_entropy = list(self.entropy_history)[-5:]
+        
+        coherence_stability = 1.0 - np.std(recent_coherence)
+        entropy_stability = 1.0 / (1.0 + np.mean(recent_entropy))
+        return (coherence_stability + entropy_stability + moral_value_avg) / 3.0
+    
+    def _sync(self, trim: bool = True):
+        """
+        Ship queued commands to the shards
+        
+        Capacity left over by earlier batches is enforced first, so workers
+        keep applying one batch while the coordinator queues the next.
+        
+        Args:
+            trim: Also enforce capacity over the batch just shipped
+        """
+        self._trim()
+        for shard, pending in enumerate(self._pending):
+            if pending:
+                self._send(shard, 'apply', pending)
+                self._sizes[shard] += sum(command[0] == 'add' for command in pending)
+                self._pending[shard] = []
+        self._pending_count = 0
+        if trim:
+            self._trim()
+    
+    def _trim(self):
+        """Evict shipped events beyond global capacity, lowest value first"""
+        excess = sum(self._sizes) - self.max_capacity
+        if excess <= 0:
+            return
+        
+        # Evict the globally lowest (moral value, insertion order) events
+        holders = [shard for shard in range(self.n_shards) if self._sizes[shard]]
+        replies = self._scatter('lowest', excess, shards=holders)
+        keys = heapq.nsmallest(excess, (
+            (moral, seq, shard) for shard, lowest in zip(holders, replies) for moral, seq in lowest))
+        evictions = [0] * self.n_shards
+        for _, _, shard in keys:
+            evictions[shard] += 1
+        for shard, count in enumerate(evictions):
+            if count:
+                self._send(shard, 'evict', count)
+                self._sizes[shard] -= count
+    
+    def _send(self, shard: int, command: str, *args):
+        """Send a command to a shard without waiting for it"""
+        self._connections[shard].send((command, False, args))
+    
+    def _scatter(self, command: str, *args, shards: List[int] = None) -> List[Any]:
+        """Run a command on shards in parallel and gather their results"""
+        shards = range(self.n_shards) if shards is None else shards
+        for shard in shards:
+            self._connections[shard].send((command, True, args))
+        
+        results = []
+        for shard in shards:
+            error, result = self._connections[shard].recv()
+            if error is not None:
+                raise error
+            results.append(result)
+        return results
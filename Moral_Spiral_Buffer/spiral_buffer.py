@@ -9,34 +9,2214 @@ Empirically optimized for stability at 432 Hz update frequency.
 """
 
 import numpy as np
+import hashlib
+import heapq
+import json
 import math
+import mmap as mmap_module
+import os
+import pickle
+import re
+import shutil
+import struct
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Any
-from collections import deque
+import weakref
+import zlib
+from array import array
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple, Any, Callable
+from collections import OrderedDict, deque
+
+
+# Harmonic resonance kernel
+#
+# Resonance peaks where the wrapped phase difference d (0-π) sits on a
+# multiple of π/2, as the max of Gaussians exp(-(d - h)² / 0.2) over
+# h in {0, π/2, π, 3π/2}. The Gaussians are monotone in |d - h|, so the max
+# is the single Gaussian of the distance to the nearest multiple of π/2:
+# one exp per pair instead of four.
+
+HARMONIC_SPACING = math.pi / 2
+HARMONIC_WIDTH = 0.2
+
+
+def _harmonic_offset(phase1, phase2):
+    """Distance from the wrapped phase difference to its nearest harmonic (0-π/4)"""
+    phase_diff = np.abs(np.subtract(phase1, phase2))
+    phase_diff = np.minimum(phase_diff, 2 * math.pi - phase_diff)
+    offset = np.mod(phase_diff, HARMONIC_SPACING)
+    return np.minimum(offset, HARMONIC_SPACING - offset)
+
+
+class HarmonicTable:
+    """
+    Precomputed lookup table for the harmonic kernel
+    
+    Samples exp(-x² / 0.2) at `size` equal intervals of width h over the
+    folded offset x in [0, π/4] and interpolates linearly. The second
+    derivative of the kernel is bounded by 10 on that range, so the
+    interpolation error is at most 10·h²/8 = 1.25·(π / (4·size))²; about
+    7.4e-7 for the default 1024 intervals.
+    """
+    
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self.step = (HARMONIC_SPACING / 2) / size
+        offsets = np.arange(size + 2) * self.step  # One spare sample past π/4
+        self.values = np.exp(-(offsets ** 2) / HARMONIC_WIDTH)
+    
+    @property
+    def max_error(self) -> float:
+        """Upper bound on the absolute interpolation error"""
+        return 1.25 * self.step ** 2
+    
+    def lookup(self, offset):
+        """Interpolated kernel value for folded offsets in [0, π/4]"""
+        position = np.asarray(offset) / self.step
+        index = np.minimum(position.astype(np.int64), self.size)
+        fraction = position - index
+        return self.values[index] + (self.values[index + 1] - self.values[index]) * fraction
+
+
+def harmonic_weight(phase1, phase2, table: Optional[HarmonicTable] = None):
+    """
+    Harmonic resonance between phases, broadcasting over arrays
+    
+    Args:
+        phase1: Phase or array of phases (0-2π)
+        phase2: Phase or array of phases (0-2π), broadcast against phase1
+        table: Optional HarmonicTable to interpolate instead of calling exp
+        
+    Returns:
+        Resonance (0-1) for each phase pair
+    """
+    offset = _harmonic_offset(phase1, phase2)
+    if table is not None:
+        return table.lookup(offset)
+    return np.exp(-(offset ** 2) / HARMONIC_WIDTH)
+
+
+class EventStore:
+    """
+    Struct-of-arrays storage for memory events
+    
+    Numeric event fields live in preallocated NumPy columns indexed by row,
+    while content objects are held in a parallel side table. Rows released
+    by eviction are recycled, and a doubly-linked list threaded through the
+    rows keeps track of insertion order.
+    """
+    
+    # Numeric columns and their dtypes
+    FIELDS = {
+        'timestamp': np.float64,
+        'phase': np.float64,              # Position in spiral buffer (0-2π)
+        'coherence_score': np.float64,    # ζ - promotes order/beneficial outcomes
+        'entropy_score': np.float64,      # S - introduces disorder/harmful effects
+        'moral_value': np.float64,        # M = ζ - S (calculated automatically)
+        'access_count': np.int64,
+        'last_accessed': np.float64,
+        'harmonic_resonance': np.float64,
+        'duplicate_count': np.int64,      # Later arrivals folded in by deduplication
+        'seq': np.int64,                  # Insertion sequence number
+        'applied_epoch': np.int64,        # Deferred-update epochs applied to the row
+    }
+    
+    # Columns that determine an event's moral standing
+    SCORE_FIELDS = ('coherence_score', 'entropy_score', 'moral_value')
+    
+    # Every per-row array, as persisted in snapshots
+    ARRAYS = tuple(FIELDS) + ('live', 'prev', 'next')
+    
+    def __init__(self, capacity: int, arrays: Dict[str, np.ndarray] = None, content=None):
+        """
+        Args:
+            capacity: Number of rows to preallocate
+            arrays: Existing per-row arrays (see ARRAYS) to adopt instead of
+                allocating, e.g. memory-mapped snapshot columns
+            content: Existing content table to adopt
+        """
+        self.capacity = capacity
+        if arrays is None:
+            arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.FIELDS.items()}
+            arrays['live'] = np.zeros(capacity, dtype=bool)
+            
+            # Insertion-order links (-1 terminates)
+            arrays['prev'] = np.full(capacity, -1, dtype=np.int64)
+            arrays['next'] = np.full(capacity, -1, dtype=np.int64)
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.content = content if content is not None else [None] * capacity
+        self.head = -1
+        self.tail = -1
+        
+        self.size = 0
+        self.high_water = 0  # Rows [0, high_water) have been used at least once
+        self._free: List[int] = []
+        self._next_seq = 0
+        self._views = weakref.WeakValueDictionary()
+        self._view_lock = threading.Lock()  # Keeps views unique when created from several threads
+        self._observers = []
+        
+        # Deferred updates: rows lagging behind `epoch` are brought up to date
+        # through the `settle` callback before their scores are read or changed
+        self.epoch = 0
+        self.settled_epoch = 0
+        self.settle = None
+        
+        # Time decay of harmonic resonance: rows -> factor applied on read
+        self.decay_factors = None
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def get_state(self) -> Dict:
+        """Scalar bookkeeping needed to restore the store from its arrays"""
+        return {
+            'capacity': self.capacity,
+            'head': int(self.head),
+            'tail': int(self.tail),
+            'size': self.size,
+            'high_water': self.high_water,
+            'free': [int(row) for row in self._free],
+            'next_seq': self._next_seq,
+            'epoch': self.epoch,
+            'settled_epoch': self.settled_epoch,
+        }
+    
+    def set_state(self, state: Dict):
+        """Restore scalar bookkeeping saved by get_state"""
+        self.head = state['head']
+        self.tail = state['tail']
+        self.size = state['size']
+        self.high_water = state['high_water']
+        self._free = list(state['free'])
+        self._next_seq = state['next_seq']
+        self.epoch = state['epoch']
+        self.settled_epoch = state['settled_epoch']
+    
+    def add_observer(self, observer):
+        """Register an index that tracks row changes (a StoreObserver)"""
+        self._observers.append(observer)
+    
+    def remove_observer(self, observer):
+        """Unregister an index added with add_observer"""
+        self._observers.remove(observer)
+    
+    def grow(self, capacity: int):
+        """
+        Enlarge the store to `capacity` rows, keeping every row in place
+        
+        Columns are reallocated (memory-mapped ones become in-memory copies)
+        and observers resize their per-row state through store_grown.
+        """
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name in self.ARRAYS:
+            column = getattr(self, name)
+            fill = -1 if name in ('prev', 'next') else 0
+            setattr(self, name, np.concatenate([column, np.full(extra, fill, dtype=column.dtype)]))
+        if isinstance(self.content, list):
+            self.content.extend([None] * extra)
+        else:
+            self.content.grow(capacity)
+        self.capacity = capacity
+        for observer in self._observers:
+            observer.store_grown(capacity)
+    
+    def allocate(self, 
+                 content: Any, 
+                 timestamp: float, 
+                 phase: float,
+                 coherence: float, 
+                 entropy: float) -> int:
+        """Store a new event at the tail of the insertion order and return its row"""
+        if self._free:
+            row = self._free.pop()
+        elif self.high_water < self.capacity:
+            row = self.high_water
+            self.high_water += 1
+        else:
+            raise MemoryError("EventStore is full")
+        
+        self.content[row] = content
+        self.timestamp[row] = timestamp
+        self.phase[row] = phase
+        self.coherence_score[row] = coherence
+        self.entropy_score[row] = entropy
+        self.moral_value[row] = coherence - entropy
+        self.access_count[row] = 0
+        self.last_accessed[row] = 0.0
+        self.harmonic_resonance[row] = 0.0
+        self.duplicate_count[row] = 0
+        self.seq[row] = self._next_seq
+        self._next_seq += 1
+        self.applied_epoch[row] = self.epoch
+        
+        self.prev[row] = self.tail
+        self.next[row] = -1
+        if self.tail >= 0:
+            self.next[self.tail] = row
+        else:
+            self.head = row
+        self.tail = row
+        
+        self.live[row] = True
+        self.size += 1
+        for observer in self._observers:
+            observer.row_added(row)
+        return row
+    
+    def release(self, row: int):
+        """Remove an event from the store, detaching any outstanding view"""
+        for observer in self._observers:
+            observer.row_removed(row)
+        
+        with self._view_lock:
+            view = self._views.pop(row, None)
+        if view is not None:
+            view._detach()
+        
+        before, after = self.prev[row], self.next[row]
+        if before >= 0:
+            self.next[before] = after
+        else:
+            self.head = after
+        if after >= 0:
+            self.prev[after] = before
+        else:
+            self.tail = before
+        
+        self.content[row] = None
+        self.live[row] = False
+        self._free.append(row)
+        self.size -= 1
+    
+    def settle_rows(self, rows):
+        """Apply any deferred updates pending on the given rows"""
+        if self.epoch != self.settled_epoch and self.settle is not None:
+            self.settle(np.asarray(rows, dtype=np.int64))
+    
+    def update_morality(self, row: int, coherence: float, entropy: float):
+        """Update morality scores for a row and recalculate its moral value"""
+        self.settle_rows((row,))
+        self.write_morality(row, coherence, entropy)
+    
+    def write_morality(self, row: int, coherence: float, entropy: float):
+        """update_morality without settling deferred updates first"""
+        old_scores = self.scores(row)
+        self.coherence_score[row] = coherence
+        self.entropy_score[row] = entropy
+        self.moral_value[row] = coherence - entropy
+        for observer in self._observers:
+            observer.row_rescored(row, old_scores)
+    
+    def update_morality_rows(self, rows: np.ndarray, coherence: np.ndarray, entropy: np.ndarray):
+        """Vectorized update_morality over several rows"""
+        self.settle_rows(rows)
+        self.write_morality_rows(rows, coherence, entropy)
+    
+    def write_morality_rows(self, rows: np.ndarray, coherence: np.ndarray, entropy: np.ndarray):
+        """update_morality_rows without settling deferred updates first"""
+        self.write_scores(rows, coherence, entropy, coherence - entropy)
+    
+    def write_scores(self, rows: np.ndarray, coherence: np.ndarray, entropy: np.ndarray, moral: np.ndarray):
+        """Assign all three score columns for several rows as given"""
+        old_scores = self.scores(rows)
+        self.coherence_score[rows] = coherence
+        self.entropy_score[rows] = entropy
+        self.moral_value[rows] = moral
+        for observer in self._observers:
+            observer.rows_rescored(rows, old_scores)
+    
+    def set_score(self, row: int, name: str, value: float):
+        """Assign a single score column without recalculating moral value"""
+        self.settle_rows((row,))
+        old_scores = self.scores(row)
+        getattr(self, name)[row] = value
+        for observer in self._observers:
+            observer.row_rescored(row, old_scores)
+    
+    def set_content(self, row: int, value: Any):
+        """Replace a row's content, notifying observers that track content"""
+        self.content[row] = value
+        for observer in self._observers:
+            observer.content_changed(row)
+    
+    def resonance(self, row: int) -> float:
+        """Harmonic resonance of a row as of now, after any time decay"""
+        if self.decay_factors is None:
+            return float(self.harmonic_resonance[row])
+        return float(self.harmonic_resonance[row] * self.decay_factors(row))
+    
+    def set_resonance(self, row: int, value: float):
+        """Assign a row's current harmonic resonance, storing it undecayed"""
+        factor = self.decay_factors(row) if self.decay_factors is not None else 1.0
+        self.harmonic_resonance[row] = value / factor if factor > 0 else 0.0
+    
+    def content_bytes(self, row: int) -> bytes:
+        """Pickled content of a row, reusing the bytes a packed content table keeps"""
+        raw = self.content.raw(row) if hasattr(self.content, 'raw') else None
+        return raw if raw is not None else pickle.dumps(self.content[row], protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def scores(self, rows) -> Tuple[Any, Any, Any]:
+        """(coherence, entropy, moral value) for a row or array of rows"""
+        return self.coherence_score[rows], self.entropy_score[rows], self.moral_value[rows]
+    
+    def view(self, row: int) -> 'MemoryEvent':
+        """Get the MemoryEvent view for a row (one shared view per row)"""
+        event = self._views.get(row)
+        if event is None:
+            with self._view_lock:
+                event = self._views.get(row)
+                if event is None:
+                    event = MemoryEvent._bind(self, row)
+                    self._views[row] = event
+        return event
+    
+    def rows(self) -> np.ndarray:
+        """Indices of all occupied rows (unordered)"""
+        return np.flatnonzero(self.live[:self.high_water])
+    
+    def ordered(self, rows: np.ndarray) -> np.ndarray:
+        """Sort rows into insertion order"""
+        return rows[np.argsort(self.seq[rows], kind='stable')]
+    
+    def recent_rows(self, count: int) -> List[int]:
+        """Rows of the most recently inserted events, oldest first"""
+        rows = []
+        row = self.tail
+        while row >= 0 and len(rows) < count:
+            rows.append(int(row))
+            row = self.prev[row]
+        rows.reverse()
+        return rows
+    
+    def iter_rows(self):
+        """Iterate over occupied rows in insertion order"""
+        row = self.head
+        while row >= 0:
+            yield int(row)
+            row = self.next[row]
+
+
+def _event_field(name: str, cast):
+    """Property exposing one EventStore column on a MemoryEvent view"""
+    settles = name in EventStore.SCORE_FIELDS
+    
+    def getter(self):
+        store = self._store
+        if settles and store.applied_epoch[self._row] != store.epoch:
+            store.settle_rows((self._row,))
+        return cast(getattr(store, name)[self._row])
+    
+    def setter(self, value):
+        if name in EventStore.SCORE_FIELDS:
+            self._store.set_score(self._row, name, value)
+        else:
+            getattr(self._store, name)[self._row] = value
+    
+    return property(getter, setter)
+
+
+class StoreObserver:
+    """
+    Base for indexes that track an EventStore's rows
+    
+    The store calls these hooks as rows change; each does nothing by
+    default, so an index overrides only the ones it needs.
+    """
+    
+    def row_added(self, row: int):
+        """A row was stored"""
+    
+    def row_removed(self, row: int):
+        """A row is being released; its data is still readable"""
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        """A row's scores changed from the (coherence, entropy, moral value) given"""
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, ...]):
+        """Several rows' scores changed from the score arrays given"""
+    
+    def content_changed(self, row: int):
+        """A row was given new content"""
+    
+    def store_grown(self, capacity: int):
+        """The store was enlarged to `capacity` rows"""
+
+
+class MoralHeap(StoreObserver):
+    """
+    Indexed min-heap of store rows keyed on (moral_value, insertion order)
+    
+    Keeps the next eviction candidate at the root so capacity management
+    costs O(log n) per insert, and re-keys a row in place whenever its
+    moral value changes. Heap, positions and keys live in typed arrays, so
+    the index costs a fixed 32 bytes per row rather than a Python int and
+    key tuple per entry.
+    """
+    
+    def __init__(self, store: EventStore):
+        self._store = store
+        self._heap = array('q')
+        self._pos = array('q', [-1]) * store.capacity
+        self._moral = array('d', [0.0]) * store.capacity
+        self._seq = array('q', [0]) * store.capacity
+        
+        # Built on first use when attached to a store that already holds rows
+        self._stale = len(store) > 0
+    
+    def __len__(self) -> int:
+        return len(self._store) if self._stale else len(self._heap)
+    
+    def peek(self) -> int:
+        """Row with the lowest moral value"""
+        if self._stale:
+            self._rebuild()
+        return self._heap[0]
+    
+    def smallest(self, count: int) -> List[int]:
+        """
+        Rows with the `count` lowest keys, lowest first
+        
+        Walks the heap best-first from the root, so it costs O(count log
+        count) rather than ordering every row.
+        """
+        if self._stale:
+            self._rebuild()
+        heap, moral, seq = self._heap, self._moral, self._seq
+        size = len(heap)
+        rows = []
+        frontier = [(moral[heap[0]], seq[heap[0]], 0)] if size else []
+        while frontier and len(rows) < count:
+            _, _, index = heapq.heappop(frontier)
+            rows.append(heap[index])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size:
+                    child_row = heap[child]
+                    heapq.heappush(frontier, (moral[child_row], seq[child_row], child))
+        return rows
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        if self._stale:
+            return
+        store = self._store
+        self._moral[row] = store.moral_value[row]
+        self._seq[row] = store.seq[row]
+        self._pos[row] = len(self._heap)
+        self._heap.append(row)
+        self._sift_up(len(self._heap) - 1)
+    
+    def row_removed(self, row: int):
+        if self._stale:
+            return
+        heap, pos = self._heap, self._pos
+        index = pos[row]
+        last = heap.pop()
+        pos[row] = -1
+        if last != row:
+            heap[index] = last
+            pos[last] = index
+            self._sift_down(index)
+            self._sift_up(pos[last])
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        if self._stale:
+            return
+        moral = float(self._store.moral_value[row])
+        old_moral = self._moral[row]
+        self._moral[row] = moral
+        if moral < old_moral:
+            self._sift_up(self._pos[row])
+        elif moral > old_moral:
+            self._sift_down(self._pos[row])
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, ...]):
+        if self._stale:
+            return
+        # Re-keying one at a time costs O(k log n); past that, rebuild outright
+        if len(rows) * max(1, len(self._heap).bit_length()) < len(self._heap):
+            for row in rows.tolist():
+                self.row_rescored(row, None)
+        else:
+            self._rebuild()
+    
+    def store_grown(self, capacity: int):
+        extra = capacity - len(self._pos)
+        self._pos.extend(array('q', [-1]) * extra)
+        self._moral.extend(array('d', [0.0]) * extra)
+        self._seq.extend(array('q', [0]) * extra)
+    
+    def _rebuild(self):
+        """Re-heapify every stored row from the current moral values"""
+        store = self._store
+        rows = store.rows()
+        
+        # A sorted array is a valid heap
+        rows = rows[np.lexsort((store.seq[rows], store.moral_value[rows]))]
+        pos = np.full(store.capacity, -1, dtype=np.int64)
+        pos[rows] = np.arange(len(rows))
+        self._heap = array('q', rows.astype(np.int64).tobytes())
+        self._pos = array('q', pos.tobytes())
+        self._moral = array('d', store.moral_value.tobytes())
+        self._seq = array('q', store.seq.tobytes())
+        self._stale = False
+    
+    # Heap maintenance
+    
+    def _sift_up(self, index: int):
+        heap, pos, moral, seq = self._heap, self._pos, self._moral, self._seq
+        row = heap[index]
+        key, order = moral[row], seq[row]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_row = heap[parent]
+            parent_key = moral[parent_row]
+            if parent_key < key or (parent_key == key and seq[parent_row] <= order):
+                break
+            heap[index] = parent_row
+            pos[parent_row] = index
+            index = parent
+        heap[index] = row
+        pos[row] = index
+    
+    def _sift_down(self, index: int):
+        heap, pos, moral, seq = self._heap, self._pos, self._moral, self._seq
+        size = len(heap)
+        row = heap[index]
+        key, order = moral[row], seq[row]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            child_row = heap[child]
+            if child + 1 < size:
+                sibling_row = heap[child + 1]
+                child_key, sibling_key = moral[child_row], moral[sibling_row]
+                if sibling_key < child_key or (sibling_key == child_key and seq[sibling_row] < seq[child_row]):
+                    child += 1
+                    child_row = sibling_row
+            child_key = moral[child_row]
+            if child_key > key or (child_key == key and seq[child_row] >= order):
+                break
+            heap[index] = child_row
+            pos[child_row] = index
+            index = child
+        heap[index] = row
+        pos[row] = index
+
+
+class RowBuckets:
+    """
+    Store rows filed under a fixed number of buckets
+    
+    Each bucket keeps its rows in a growable array, and a position map
+    records every row's bucket and slot, so filing a row costs O(1) and so
+    does taking it out, by moving the bucket's last row into its slot.
+    """
+    
+    _EMPTY = np.empty(0, dtype=np.int64)
+    
+    def __init__(self, n_buckets: int, capacity: int):
+        self.n_buckets = n_buckets
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+        self.bucket_of = np.full(capacity, -1, dtype=np.int64)  # -1 if not filed
+        self._slot = np.full(capacity, -1, dtype=np.int64)
+        self._members: List[Optional[np.ndarray]] = [None] * n_buckets
+    
+    def rows(self, bucket: int) -> np.ndarray:
+        """Rows currently in a bucket"""
+        members = self._members[bucket]
+        return self._EMPTY if members is None else members[:self.counts[bucket]]
+    
+    def add(self, row: int, bucket: int):
+        """File a row under a bucket"""
+        count = self.counts[bucket]
+        members = self._members[bucket]
+        if members is None:
+            members = self._members[bucket] = np.empty(8, dtype=np.int64)
+        elif count == len(members):
+            members = np.concatenate([members, np.empty(len(members), dtype=np.int64)])
+            self._members[bucket] = members
+        members[count] = row
+        self.counts[bucket] = count + 1
+        self.bucket_of[row] = bucket
+        self._slot[row] = count
+    
+    def remove(self, row: int) -> int:
+        """Take a row out of its bucket and return that bucket"""
+        bucket, slot = self.bucket_of[row], self._slot[row]
+        members = self._members[bucket]
+        last = self.counts[bucket] - 1
+        moved = members[last]
+        members[slot] = moved
+        self._slot[moved] = slot
+        self.counts[bucket] = last
+        self.bucket_of[row] = -1
+        self._slot[row] = -1
+        return bucket
+    
+    def grow(self, capacity: int):
+        """Extend the position map to `capacity` rows"""
+        extra = capacity - len(self.bucket_of)
+        self.bucket_of = np.concatenate([self.bucket_of, np.full(extra, -1, dtype=np.int64)])
+        self._slot = np.concatenate([self._slot, np.full(extra, -1, dtype=np.int64)])
+    
+    def fill(self, rows: np.ndarray, buckets: np.ndarray, n_buckets: int = None):
+        """
+        File exactly the given rows, replacing every bucket's contents
+        
+        Args:
+            rows: Rows to file
+            buckets: Bucket of each row
+            n_buckets: New number of buckets (defaults to the current one)
+        """
+        if n_buckets is not None:
+            self.n_buckets = n_buckets
+        order = np.argsort(buckets, kind='stable')
+        rows, buckets = rows[order], buckets[order]
+        self.counts = np.bincount(buckets, minlength=self.n_buckets).astype(np.int64)
+        starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]]).astype(np.int64)
+        self.bucket_of[:] = -1
+        self._slot[:] = -1
+        self.bucket_of[rows] = buckets
+        self._slot[rows] = np.arange(len(rows)) - starts[buckets]
+        self._members = [
+            np.concatenate([rows[start:start + count], np.empty(max(8, count), dtype=np.int64)]) if count else None
+            for start, count in zip(starts.tolist(), self.counts.tolist())
+        ]
+
+
+class MoralBuckets(RowBuckets):
+    """
+    RowBuckets that also bound each bucket's largest moral value
+    
+    Maxima are kept as upper bounds: they rise immediately, and a bucket
+    that may have lost its maximum is marked loose and tightened when its
+    rows are next gathered. top() uses them to rank buckets by the best
+    recall score they can hold and score only the buckets that matter.
+    """
+    
+    # Added to every bucket bound to absorb rounding in the exact scores
+    BOUND_SLACK = 1e-9
+    
+    def __init__(self, n_buckets: int, store: EventStore):
+        super().__init__(n_buckets, store.capacity)
+        self._store = store
+        self.max_moral = np.full(n_buckets, -np.inf)
+        self._loose = np.zeros(n_buckets, dtype=bool)  # Maximum may exceed every member's moral value
+    
+    def add(self, row: int, bucket: int):
+        super().add(row, bucket)
+        moral = self._store.moral_value[row]
+        if moral > self.max_moral[bucket]:
+            self.max_moral[bucket] = moral
+    
+    def remove(self, row: int) -> int:
+        bucket = super().remove(row)
+        if self.counts[bucket]:
+            self._loose[bucket] = True
+        else:
+            self.max_moral[bucket] = -np.inf
+            self._loose[bucket] = False
+        return bucket
+    
+    def fill(self, rows: np.ndarray, buckets: np.ndarray, n_buckets: int = None):
+        super().fill(rows, buckets, n_buckets)
+        self.max_moral = np.full(self.n_buckets, -np.inf)
+        np.maximum.at(self.max_moral, buckets, self._store.moral_value[rows])
+        self._loose = np.zeros(self.n_buckets, dtype=bool)
+    
+    def rescored(self, row: int, old_moral: float = None):
+        """Account for a new moral value of a filed row (old value unknown if None)"""
+        bucket = self.bucket_of[row]
+        moral = self._store.moral_value[row]
+        if moral > self.max_moral[bucket]:
+            self.max_moral[bucket] = moral
+        elif old_moral is None or (moral < old_moral and old_moral >= self.max_moral[bucket]):
+            self._loose[bucket] = True
+    
+    def rows_rescored(self, rows: np.ndarray, old_moral: np.ndarray):
+        """Vectorized rescored over several filed rows"""
+        buckets = self.bucket_of[rows]
+        moral = self._store.moral_value[rows]
+        lost = (moral < old_moral) & (old_moral >= self.max_moral[buckets])
+        self._loose[buckets[lost]] = True
+        np.maximum.at(self.max_moral, buckets, moral)
+    
+    def gather(self, buckets) -> np.ndarray:
+        """Rows of the given buckets, tightening loose maxima on the way"""
+        moral_value = self._store.moral_value
+        parts = [self._EMPTY]
+        for bucket in buckets:
+            rows = self.rows(bucket)
+            if self._loose[bucket]:
+                self.max_moral[bucket] = moral_value[rows].max() if len(rows) else -np.inf
+                self._loose[bucket] = False
+            parts.append(rows)
+        return np.concatenate(parts)
+    
+    def top(self, buffer: 'SpiralBuffer', bounds: np.ndarray, target_coherence: float, top_k: int,
+            epsilon: float = 0.0) -> np.ndarray:
+        """
+        Best recall rows, scoring buckets in order of their bound
+        
+        Scores the buckets with the highest bounds until they hold top_k
+        rows, then only the other buckets whose bound reaches the k-th score
+        found plus epsilon. Every row skipped therefore scores below the
+        returned k-th score plus epsilon, and with epsilon 0 the result is
+        the brute-force ranking.
+        
+        Args:
+            buffer: Buffer supplying the exact scores and tie-breaking
+            bounds: Upper bound on the recall score of each bucket's rows
+                (-inf for empty buckets)
+            target_coherence: Desired coherence level (0-1)
+            top_k: Number of rows to return
+            epsilon: Score tolerance; 0 for the exact ranking
+            
+        Returns:
+            Rows, best first
+        """
+        occupied = int(np.count_nonzero(self.counts))
+        if top_k <= 0 or not occupied:
+            return self._EMPTY
+        bounds = bounds + self.BOUND_SLACK
+        
+        # Best-bounded buckets until they hold top_k rows
+        take = min(8, occupied)
+        while True:
+            first = np.argpartition(-bounds, take - 1)[:take] if take < len(bounds) else np.arange(len(bounds))
+            rows = self.gather(first.tolist())
+            if len(rows) >= top_k or take == occupied:
+                break
+            take = min(2 * take, occupied)
+        scores = buffer._recall_scores(rows, target_coherence)
+        
+        # Any other bucket that can reach the k-th score so far
+        if len(rows) >= top_k:
+            kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+            bounds[first] = -np.inf
+            rest = np.flatnonzero(bounds >= kth_score + max(epsilon, 0.0))
+            if len(rest):
+                more = self.gather(rest.tolist())
+                rows = np.concatenate([rows, more])
+                scores = np.concatenate([scores, buffer._recall_scores(more, target_coherence)])
+        return buffer._select_top(rows, scores, top_k)
+
+
+class PhaseIndex(StoreObserver):
+    """
+    Angular range index over event phases
+    
+    Partitions [0, 2π) into fixed-width sectors, each holding the rows whose
+    phase falls inside it. A neighbor query gathers the sectors fully inside
+    the requested arc wholesale and filters only the two boundary sectors by
+    exact distance, so it costs O(sectors spanned + k) rather than O(n).
+    
+    Each sector also keeps the running sum of its rows' moral values, so
+    window_totals() can average an arc from sector totals plus the two
+    boundary sectors without gathering the rows in between, and a bound on
+    their largest, so top() can answer approximate recall sector by sector.
+    """
+    
+    def __init__(self, store: EventStore, sectors: int = None):
+        self._store = store
+        self.n_sectors = sectors or min(1 << 16, max(16, store.capacity // 32))
+        self.width = 2 * math.pi / self.n_sectors
+        self._sectors = MoralBuckets(self.n_sectors, store)
+        self._moral_sums = np.zeros(self.n_sectors, dtype=np.float64)
+        
+        # Built on first use when attached to a store that already holds rows
+        self._stale = len(store) > 0
+    
+    _EMPTY = RowBuckets._EMPTY
+    
+    def sector(self, phase: float) -> int:
+        """Sector containing a phase"""
+        return int(phase // self.width) % self.n_sectors
+    
+    def sector_rows(self, sector: int) -> np.ndarray:
+        """Rows currently in a sector"""
+        if self._stale:
+            self._rebuild()
+        return self._sectors.rows(sector)
+    
+    def _rebuild(self):
+        """Rebuild every sector from the store's phase column"""
+        store = self._store
+        rows = store.rows()
+        sectors = (store.phase[rows] // self.width).astype(np.int64) % self.n_sectors
+        self._sectors.fill(rows, sectors)
+        self._moral_sums = np.bincount(sectors, weights=store.moral_value[rows], minlength=self.n_sectors)
+        self._stale = False
+    
+    def query(self, phase: float, radius: float) -> np.ndarray:
+        """Rows within the given angular radius of a phase (unordered)"""
+        if self._stale:
+            self._rebuild()
+        low = math.floor((phase - radius) / self.width)
+        high = math.floor((phase + radius) / self.width)
+        
+        if high - low + 1 >= self.n_sectors:
+            edge_sectors, interior = range(self.n_sectors), []
+        else:
+            edge_sectors = {low % self.n_sectors, high % self.n_sectors}
+            interior = [sector % self.n_sectors for sector in range(low + 1, high)]
+        
+        parts = [self.sector_rows(sector) for sector in interior]
+        edge_rows = np.concatenate([self.sector_rows(sector) for sector in edge_sectors])
+        diff = np.abs(self._store.phase[edge_rows] - phase)
+        distance = np.minimum(diff, 2 * math.pi - diff)
+        parts.append(edge_rows[distance <= radius])
+        return np.concatenate(parts)
+    
+    def top(self, buffer: 'SpiralBuffer', target_coherence: float, top_k: int, epsilon: float) -> np.ndarray:
+        """
+        Rows of approximate recall, best first
+        
+        A sector's recall score is bounded by its largest moral value and the
+        harmonic weight at its phase nearest a harmonic peak, with coherence
+        similarity bounded only by 1, so every returned row scores at least
+        the exact k-th best minus epsilon (see MoralBuckets.top).
+        """
+        if self._stale:
+            self._rebuild()
+        bounds = self._sectors.max_moral * 0.4 + buffer._harmonic_bin_bounds(self.n_sectors) * 0.3 + 0.3
+        return self._sectors.top(buffer, bounds, target_coherence, top_k, epsilon)
+    
+    def window_totals(self, phase: float, radius: float) -> Tuple[int, float]:
+        """(count, moral value sum) of the rows within the given angular radius of a phase"""
+        if self._stale:
+            self._rebuild()
+        low = math.floor((phase - radius) / self.width)
+        high = math.floor((phase + radius) / self.width)
+        if high - low + 1 >= self.n_sectors:
+            rows = self.query(phase, radius)
+            return len(rows), float(self._store.moral_value[rows].sum())
+        
+        # Interior sectors from their totals, as one or two contiguous runs
+        start, length = (low + 1) % self.n_sectors, max(high - low - 1, 0)
+        runs = [(start, min(start + length, self.n_sectors))]
+        if start + length > self.n_sectors:
+            runs.append((0, start + length - self.n_sectors))
+        count = sum(int(self._sectors.counts[begin:end].sum()) for begin, end in runs)
+        moral_sum = sum(float(self._moral_sums[begin:end].sum()) for begin, end in runs)
+        
+        edge_sectors = {low % self.n_sectors, high % self.n_sectors}
+        edge_rows = np.concatenate([self.sector_rows(sector) for sector in edge_sectors])
+        diff = np.abs(self._store.phase[edge_rows] - phase)
+        inside = edge_rows[np.minimum(diff, 2 * math.pi - diff) <= radius]
+        return count + len(inside), moral_sum + float(self._store.moral_value[inside].sum())
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        if self._stale:
+            return
+        sector = self.sector(self._store.phase[row])
+        self._sectors.add(row, sector)
+        self._moral_sums[sector] += self._store.moral_value[row]
+    
+    def row_removed(self, row: int):
+        if self._stale:
+            return
+        sector = self._sectors.remove(row)
+        self._moral_sums[sector] -= self._store.moral_value[row]
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        if self._stale:
+            return
+        self._moral_sums[self._sectors.bucket_of[row]] += self._store.moral_value[row] - old_scores[2]
+        self._sectors.rescored(row, old_scores[2])
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, ...]):
+        if self._stale:
+            return
+        np.add.at(self._moral_sums, self._sectors.bucket_of[rows], self._store.moral_value[rows] - old_scores[2])
+        self._sectors.rows_rescored(rows, old_scores[2])
+    
+    def store_grown(self, capacity: int):
+        self._sectors.grow(capacity)
+
+
+class RecallIndex(StoreObserver):
+    """
+    Grid index over (phase, coherence) for exact top-k recall
+    
+    The recall score 0.4·moral + 0.3·harmonic(phase) + 0.3·(1 - |coherence -
+    target|) is bounded over a grid cell by the cell's largest moral value,
+    the harmonic weight at the cell's phase nearest a harmonic peak, and the
+    coherence similarity at the cell's coherence nearest the target. A query
+    scores the cells with the highest bounds until it holds top_k rows, then
+    scores only the cells whose bound reaches the k-th score found, so it
+    returns exactly the brute-force ranking while touching a few cells.
+    
+    With a tolerance epsilon > 0 it also skips cells whose bound exceeds the
+    k-th score found by less than epsilon. Every row it can miss then scores
+    below that k-th score plus epsilon, so each returned row scores at least
+    the exact k-th best minus epsilon.
+    
+    Per-cell moral maxima are kept as upper bounds (see MoralBuckets).
+    """
+    
+    def __init__(self, store: EventStore, cells: int = None):
+        self._store = store
+        cells = cells or min(1 << 15, max(64, store.capacity // 32))
+        self.coherence_bins = max(4, int(math.sqrt(cells / 2)))
+        self.phase_bins = max(8, cells // self.coherence_bins)
+        self.n_cells = self.phase_bins * self.coherence_bins
+        self.phase_width = 2 * math.pi / self.phase_bins
+        
+        self._cells = MoralBuckets(self.n_cells, store)
+        
+        # Built on first use when attached to a store that already holds rows
+        self._stale = len(store) > 0
+    
+    def cells(self, phases, coherences) -> Any:
+        """Grid cell of each (phase, coherence) pair"""
+        phase_bins = (np.asarray(phases) // self.phase_width).astype(np.int64) % self.phase_bins
+        coherence_bins = np.clip(np.floor(np.asarray(coherences) * self.coherence_bins), 
+                                 0, self.coherence_bins - 1).astype(np.int64)
+        return phase_bins * self.coherence_bins + coherence_bins
+    
+    def cell(self, phase: float, coherence: float) -> int:
+        """Grid cell of a single (phase, coherence) pair"""
+        coherence_bin = min(max(math.floor(coherence * self.coherence_bins), 0), self.coherence_bins - 1)
+        return int(phase // self.phase_width) % self.phase_bins * self.coherence_bins + coherence_bin
+    
+    def cell_rows(self, cell: int) -> np.ndarray:
+        """Rows currently in a cell"""
+        return self._cells.rows(cell)
+    
+    def top(self, buffer: 'SpiralBuffer', target_coherence: float, top_k: int,
+            epsilon: float = 0.0) -> np.ndarray:
+        """
+        Rows recall_by_coherence returns, best first
+        
+        Args:
+            buffer: Buffer supplying the current phase, exact scores and tie-breaking
+            target_coherence: Desired coherence level (0-1)
+            top_k: Number of rows to return
+            epsilon: Score tolerance; 0 for the exact ranking
+            
+        Returns:
+            The same rows, in the same order, as ranking every stored row when
+            epsilon is 0; otherwise rows scoring within epsilon of the exact
+            k-th best, best first
+        """
+        if self._stale:
+            self._rebuild()
+        return self._cells.top(buffer, self._bounds(buffer, target_coherence), target_coherence, top_k, epsilon)
+    
+    def _bounds(self, buffer: 'SpiralBuffer', target_coherence: float) -> np.ndarray:
+        """Upper bound on the recall score of every cell (-inf when empty)"""
+        harmonic = buffer._harmonic_bin_bounds(self.phase_bins)
+        edges = np.arange(self.coherence_bins + 1) / self.coherence_bins
+        low, high = edges[:-1].copy(), edges[1:].copy()
+        low[0], high[-1] = -np.inf, np.inf
+        similarity = 1.0 - np.maximum(0.0, np.maximum(low - target_coherence, target_coherence - high))
+        
+        bounds = (self._cells.max_moral.reshape(self.phase_bins, self.coherence_bins) * 0.4 +
+                  harmonic[:, None] * 0.3 + similarity[None, :] * 0.3)
+        return bounds.ravel()
+    
+    def _rebuild(self):
+        """Rebuild every cell from the store's phase and coherence columns"""
+        store = self._store
+        rows = store.rows()
+        self._cells.fill(rows, self.cells(store.phase[rows], store.coherence_score[rows]))
+        self._stale = False
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        if not self._stale:
+            store = self._store
+            self._cells.add(row, self.cell(float(store.phase[row]), float(store.coherence_score[row])))
+    
+    def row_removed(self, row: int):
+        if not self._stale:
+            self._cells.remove(row)
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        if self._stale:
+            return
+        store = self._store
+        cell = self.cell(float(store.phase[row]), float(store.coherence_score[row]))
+        if cell != self._cells.bucket_of[row]:
+            self._cells.remove(row)
+            self._cells.add(row, cell)
+        else:
+            self._cells.rescored(row, None if old_scores is None else old_scores[2])
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, ...]):
+        if self._stale:
+            return
+        # Moving rows one at a time costs O(k); past an eighth of the store, rebuild outright
+        if 8 * len(rows) < len(self._store):
+            for row in rows.tolist():
+                self.row_rescored(row, None)
+        else:
+            self._rebuild()
+    
+    def store_grown(self, capacity: int):
+        self._cells.grow(capacity)
+
+
+class RecallCache(StoreObserver):
+    """
+    LRU cache of recall results invalidated by a mutation generation
+    
+    Any change the store reports to its observers (insert, eviction,
+    expiry, rescoring by stabilization or reinforcement, new content) bumps
+    the generation; an entry is served only while the generation and the
+    store's deferred-update epoch are those it was computed under.
+    """
+    
+    def __init__(self, store: EventStore, size: int = 128):
+        self._store = store
+        self.size = size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()  # Concurrent readers share the cache
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Tuple) -> Optional[np.ndarray]:
+        """Cached rows for a key, if still current"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == (self.generation, self._store.epoch):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Tuple, rows: np.ndarray):
+        """Cache rows for a key as of the current generation"""
+        with self._lock:
+            self._entries[key] = ((self.generation, self._store.epoch), rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        self.generation += 1
+    
+    def row_removed(self, row: int):
+        self.generation += 1
+    
+    def content_changed(self, row: int):
+        self.generation += 1
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        self.generation += 1
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, ...]):
+        self.generation += 1
+
+
+class HashingFeaturizer:
+    """
+    Hashed bag-of-words featurizer for event content
+    
+    Lower-cased word tokens of the content's text are hashed with CRC-32
+    into `dim` buckets, each adding +1 or -1 by the hash's top bit so that
+    collisions tend to cancel rather than pile up. CRC-32 does not vary
+    between processes, so embeddings saved in a snapshot match those
+    computed after loading it.
+    """
+    
+    TOKEN_PATTERN = re.compile(r"\w+")
+    
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+    
+    def __call__(self, content: Any) -> np.ndarray:
+        tokens = self.TOKEN_PATTERN.findall(self.text(content).lower())
+        if not tokens:
+            return np.zeros(self.dim, dtype=np.float32)
+        hashes = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.uint32, count=len(tokens))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        return np.bincount(hashes % self.dim, weights=signs, minlength=self.dim).astype(np.float32)
+    
+    @staticmethod
+    def text(content: Any) -> str:
+        """Text of a content object: itself for strings, its `text` attribute or key if any, else str()"""
+        if isinstance(content, str):
+            return content
+        if content is None:
+            return ''
+        text = content.get('text') if isinstance(content, dict) else getattr(content, 'text', None)
+        return text if isinstance(text, str) else str(content)
+
+
+class EmbeddingIndex(StoreObserver):
+    """
+    Fixed-dimension float32 embedding of every stored event's content
+    
+    Content is featurized when a row is added or given new content, and
+    kept L2-normalized in one (capacity, dim) matrix, so cosine similarity
+    of a query against every row is a single matrix-vector product.
+    
+    With ivf_lists set, an inverted file narrows that scan: once the store
+    holds IVF_TRAIN_FACTOR rows per list, spherical k-means picks ivf_lists
+    centroids, each row is filed under its nearest centroid, and a query
+    scores only the rows of the lists whose centroids are nearest to it.
+    Centroids stay fixed as rows come and go; train() refits them.
+    """
+    
+    # Rows per inverted-file list needed before the centroids are trained
+    IVF_TRAIN_FACTOR = 32
+    
+    # Training sample size per list, and k-means iterations over it
+    IVF_SAMPLE_FACTOR = 256
+    IVF_ITERATIONS = 10
+    
+    # Rows assigned to lists per matrix product when filing in bulk
+    ASSIGN_CHUNK_SIZE = 16384
+    
+    def __init__(self, 
+                 store: EventStore, 
+                 featurizer: Callable[[Any], np.ndarray], 
+                 dim: int,
+                 ivf_lists: int = None, 
+                 ivf_probe: int = 8):
+        self._store = store
+        self.featurizer = featurizer
+        self.dim = dim
+        self.vectors = np.zeros((store.capacity, dim), dtype=np.float32)
+        
+        # Inverted file: centroid per list and the rows filed under each
+        self.ivf_lists = ivf_lists
+        self.ivf_probe = ivf_probe
+        self.centroids: Optional[np.ndarray] = None
+        self._lists = RowBuckets(0, store.capacity)
+        
+        # Built on first use when attached to a store that already holds rows;
+        # the lock keeps concurrent readers from building it twice
+        self._stale = len(store) > 0
+        self._build_lock = threading.Lock()
+    
+    def embed(self, content: Any) -> np.ndarray:
+        """Normalized embedding of a content object"""
+        return self._normalized(self.featurizer(content))
+    
+    def query_vector(self, query: Any) -> np.ndarray:
+        """Normalized embedding of a query given as a vector (NumPy array) or as content"""
+        if isinstance(query, np.ndarray):
+            return self._normalized(query)
+        return self.embed(query)
+    
+    def embeddings(self) -> np.ndarray:
+        """Embedding matrix, one row per store row (zeros for unused rows)"""
+        self._build()
+        return self.vectors
+    
+    def set_embeddings(self, vectors: np.ndarray):
+        """Adopt embeddings saved by embeddings() instead of featurizing stored content"""
+        self.vectors = vectors
+        self._stale = False
+        if self.ivf_lists and len(self._store) >= self.IVF_TRAIN_FACTOR * self.ivf_lists:
+            self.train()
+    
+    def candidates(self, vector: np.ndarray, n_probe: int = None) -> np.ndarray:
+        """
+        Rows to score for a query
+        
+        Args:
+            vector: Normalized query embedding
+            n_probe: Inverted-file lists to scan (defaults to ivf_probe)
+            
+        Returns:
+            Rows of the nearest lists once the inverted file is trained,
+            otherwise every stored row
+        """
+        self._build()
+        if self.centroids is None:
+            return self._store.rows()
+        n_probe = min(max(1, n_probe or self.ivf_probe), len(self.centroids))
+        closeness = self.centroids @ vector
+        nearest = np.argpartition(-closeness, n_probe - 1)[:n_probe] if n_probe < len(closeness) else range(len(closeness))
+        return np.concatenate([PhaseIndex._EMPTY] + [self.list_rows(index) for index in nearest])
+    
+    def similarities(self, rows: np.ndarray, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each row's embedding to a normalized query"""
+        # Past half the used rows, one product over the whole column beats gathering
+        high_water = self._store.high_water
+        if 2 * len(rows) > high_water:
+            return (self.vectors[:high_water] @ vector)[rows]
+        return self.vectors[rows] @ vector
+    
+    def list_rows(self, index: int) -> np.ndarray:
+        """Rows filed under an inverted-file list"""
+        return self._lists.rows(index)
+    
+    def train(self):
+        """Fit the inverted-file centroids to the stored rows and refile every row"""
+        self._build()
+        store = self._store
+        rows = store.rows()
+        lists = min(self.ivf_lists, len(rows))
+        if not lists:
+            return
+        
+        # Spherical k-means on a fixed-seed sample
+        rng = np.random.default_rng(0)
+        sample_size = min(len(rows), self.IVF_SAMPLE_FACTOR * lists)
+        sample = self.vectors[rng.choice(rows, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, lists, replace=False)].copy()
+        for _ in range(self.IVF_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            counts = np.bincount(assignment, minlength=lists)
+            filled = counts > 0  # Empty lists keep their centroid
+            starts = np.cumsum(counts) - counts
+            centroids[filled] = np.add.reduceat(sample[np.argsort(assignment, kind='stable')], starts[filled])
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self.centroids = centroids
+        
+        # File every row under its nearest centroid
+        assignment = np.concatenate([PhaseIndex._EMPTY] + [
+            np.argmax(self.vectors[rows[start:start + self.ASSIGN_CHUNK_SIZE]] @ centroids.T, axis=1)
+            for start in range(0, len(rows), self.ASSIGN_CHUNK_SIZE)
+        ])
+        self._lists.fill(rows, assignment, lists)
+    
+    def _normalized(self, vector) -> np.ndarray:
+        """A vector as float32 scaled to unit length (zero stays zero)"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if len(vector) != self.dim:
+            raise ValueError(f"Embedding has {len(vector)} dimensions, expected {self.dim}")
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+    
+    def _build(self):
+        """Rebuild the index if it is stale"""
+        if self._stale:
+            with self._build_lock:
+                if self._stale:
+                    self._rebuild()
+    
+    def _rebuild(self):
+        """Featurize every stored row, then refile them if the inverted file is trained"""
+        store = self._store
+        self.vectors[:] = 0.0
+        for row in store.rows().tolist():
+            self.vectors[row] = self.embed(store.content[row])
+        self._stale = False
+        if self.centroids is not None or (self.ivf_lists and len(store) >= self.IVF_TRAIN_FACTOR * self.ivf_lists):
+            self.train()
+    
+    def _file(self, row: int):
+        """File a row under the list of its nearest centroid"""
+        self._lists.add(row, int(np.argmax(self.centroids @ self.vectors[row])))
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        if self._stale:
+            return
+        store = self._store
+        self.vectors[row] = self.embed(store.content[row])
+        if self.centroids is not None:
+            self._file(row)
+        elif self.ivf_lists and len(store) >= self.IVF_TRAIN_FACTOR * self.ivf_lists:
+            self.train()
+    
+    def row_removed(self, row: int):
+        if self._stale:
+            return
+        if self._lists.bucket_of[row] >= 0:
+            self._lists.remove(row)
+        self.vectors[row] = 0.0
+    
+    def content_changed(self, row: int):
+        if self._stale:
+            return
+        self.row_removed(row)
+        self.vectors[row] = self.embed(self._store.content[row])
+        if self.centroids is not None:
+            self._file(row)
+    
+    def store_grown(self, capacity: int):
+        extra = capacity - len(self.vectors)
+        self.vectors = np.concatenate([self.vectors, np.zeros((extra, self.dim), dtype=np.float32)])
+        self._lists.grow(capacity)
+
+
+class SnapshotContent:
+    """
+    Content table backed by an offset-indexed blob of pickled objects
+    
+    Row i's pickle occupies blob[offsets[i]:offsets[i + 1]] (empty for rows
+    without content). Objects are unpickled on first access, so opening a
+    snapshot materializes no content up front; assignments stay in memory.
+    """
+    
+    def __init__(self, blob, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+        self._loaded: Dict[int, Any] = {}
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, row: int) -> Any:
+        try:
+            return self._loaded[row]
+        except KeyError:
+            pass
+        raw = self.raw(row)
+        value = pickle.loads(raw) if raw is not None else None
+        self._loaded[row] = value
+        return value
+    
+    def __setitem__(self, row: int, value: Any):
+        self._loaded[row] = value
+    
+    def grow(self, capacity: int):
+        """Add rows without content up to `capacity`"""
+        extra = capacity + 1 - len(self._offsets)
+        self._offsets = np.concatenate([self._offsets, np.full(extra, self._offsets[-1], dtype=np.int64)])
+    
+    def raw(self, row: int) -> Optional[bytes]:
+        """Pickled bytes for a row not reassigned since loading, else None"""
+        if row in self._loaded:
+            return None
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return self._blob[start:end] if end > start else None
+
+
+class ContentStore:
+    """
+    Event content packed as pickles into one growable byte arena
+    
+    Each object gets an integer handle indexing offset/length columns, so
+    stored content costs its pickled size plus 16 bytes instead of a live
+    object graph. Objects are unpickled on every get(); space released by
+    evicted content is reclaimed by compacting the arena once more than
+    COMPACT_RATIO of it is garbage.
+    """
+    
+    COMPACT_RATIO = 0.5
+    
+    def __init__(self, capacity: int = 1024):
+        self._arena = bytearray()
+        self._offsets = np.zeros(capacity, dtype=np.int64)
+        self._lengths = np.full(capacity, -1, dtype=np.int64)  # -1 marks a free handle
+        self._free: List[int] = []
+        self._high_water = 0
+        self._garbage = 0
+    
+    def __len__(self) -> int:
+        return self._high_water - len(self._free)
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arena and handle columns"""
+        return len(self._arena) + self._offsets.nbytes + self._lengths.nbytes
+    
+    def put(self, content: Any) -> int:
+        """Store an object and return its handle"""
+        return self.put_raw(pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL))
+    
+    def put_raw(self, raw: bytes) -> int:
+        """Store an already pickled object and return its handle"""
+        if self._free:
+            handle = self._free.pop()
+        else:
+            handle = self._high_water
+            self._high_water += 1
+            if handle == len(self._offsets):
+                self._offsets = np.concatenate([self._offsets, np.zeros(handle, dtype=np.int64)])
+                self._lengths = np.concatenate([self._lengths, np.full(handle, -1, dtype=np.int64)])
+        
+        self._offsets[handle] = len(self._arena)
+        self._lengths[handle] = len(raw)
+        self._arena += raw
+        return handle
+    
+    def get(self, handle: int) -> Any:
+        """Unpickle the object behind a handle"""
+        return pickle.loads(self.raw(handle))
+    
+    def raw(self, handle: int) -> bytes:
+        """Pickled bytes behind a handle"""
+        offset = self._offsets[handle]
+        return bytes(self._arena[offset:offset + self._lengths[handle]])
+    
+    def release(self, handle: int):
+        """Free a handle and its bytes"""
+        self._garbage += int(self._lengths[handle])
+        self._lengths[handle] = -1
+        self._free.append(handle)
+        if self._garbage > self.COMPACT_RATIO * len(self._arena):
+            self.compact()
+    
+    def compact(self):
+        """Rewrite the arena without released bytes (handles are unchanged)"""
+        live = np.flatnonzero(self._lengths[:self._high_water] >= 0)
+        live = live[np.argsort(self._offsets[live], kind='stable')]
+        arena = self._arena
+        self._arena = bytearray().join(
+            arena[offset:offset + length] 
+            for offset, length in zip(self._offsets[live].tolist(), self._lengths[live].tolist()))
+        lengths = self._lengths[live]
+        self._offsets[live] = np.cumsum(lengths) - lengths
+        self._garbage = 0
+
+
+class PackedContent:
+    """
+    Row-indexed content table keeping each row's content in a ContentStore
+    
+    Rows hold integer handles (-1 without content) instead of object
+    references; EventStore uses it like a list.
+    """
+    
+    def __init__(self, capacity: int, content_store: ContentStore = None):
+        self.handles = np.full(capacity, -1, dtype=np.int64)
+        self.content_store = content_store if content_store is not None else ContentStore(capacity)
+    
+    def __len__(self) -> int:
+        return len(self.handles)
+    
+    def __getitem__(self, row: int) -> Any:
+        handle = self.handles[row]
+        return None if handle < 0 else self.content_store.get(handle)
+    
+    def __setitem__(self, row: int, value: Any):
+        if self.handles[row] >= 0:
+            self.content_store.release(self.handles[row])
+        self.handles[row] = -1 if value is None else self.content_store.put(value)
+    
+    def grow(self, capacity: int):
+        """Add rows without content up to `capacity`"""
+        self.handles = np.concatenate([self.handles, np.full(capacity - len(self.handles), -1, dtype=np.int64)])
+    
+    def raw(self, row: int) -> Optional[bytes]:
+        """Pickled bytes for a row, or None without content"""
+        handle = self.handles[row]
+        return None if handle < 0 else self.content_store.raw(handle)
+
+
+class MoralAggregates(StoreObserver):
+    """
+    Running sums over stored events for constant-time system metrics
+    
+    Tracks the count and the sums of moral value, coherence and entropy,
+    plus the number of high-value events, from store observer callbacks.
+    When `recompute_interval` is set, the sums are rebuilt exactly from the
+    columns after that many updates to bound floating-point drift.
+    """
+    
+    HIGH_VALUE_THRESHOLD = 0.7
+    
+    def __init__(self, store: EventStore, recompute_interval: int = None):
+        self._store = store
+        self.recompute_interval = recompute_interval
+        self.recompute()
+    
+    def get_state(self) -> Dict:
+        """Running sums, for snapshots"""
+        return {
+            'count': self.count,
+            'moral_sum': self.moral_sum,
+            'coherence_sum': self.coherence_sum,
+            'entropy_sum': self.entropy_sum,
+            'high_value_count': self.high_value_count,
+            'updates': self._updates,
+        }
+    
+    def set_state(self, state: Dict):
+        """Restore running sums saved by get_state"""
+        self.count = state['count']
+        self.moral_sum = state['moral_sum']
+        self.coherence_sum = state['coherence_sum']
+        self.entropy_sum = state['entropy_sum']
+        self.high_value_count = state['high_value_count']
+        self._updates = state['updates']
+    
+    def recompute(self):
+        """Rebuild every aggregate exactly from the store columns"""
+        store = self._store
+        rows = store.rows()
+        self.count = len(rows)
+        self.moral_sum = float(np.sum(store.moral_value[rows]))
+        self.coherence_sum = float(np.sum(store.coherence_score[rows]))
+        self.entropy_sum = float(np.sum(store.entropy_score[rows]))
+        self.high_value_count = int(np.count_nonzero(store.moral_value[rows] > self.HIGH_VALUE_THRESHOLD))
+        self._updates = 0
+    
+    def means(self) -> Tuple[float, float, float]:
+        """Mean (moral value, coherence, entropy) over stored events"""
+        if self.recompute_interval and self._updates >= self.recompute_interval:
+            self.recompute()
+        count = max(self.count, 1)
+        return self.moral_sum / count, self.coherence_sum / count, self.entropy_sum / count
+    
+    def _apply(self, sign: int, coherence: float, entropy: float, moral: float):
+        self.coherence_sum += sign * coherence
+        self.entropy_sum += sign * entropy
+        self.moral_sum += sign * moral
+        self.high_value_count += sign * (moral > self.HIGH_VALUE_THRESHOLD)
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        self.count += 1
+        self._apply(1, *map(float, self._store.scores(row)))
+        self._updates += 1
+    
+    def row_removed(self, row: int):
+        self.count -= 1
+        self._apply(-1, *map(float, self._store.scores(row)))
+        self._updates += 1
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        self._apply(-1, *map(float, old_scores))
+        self._apply(1, *map(float, self._store.scores(row)))
+        self._updates += 1
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, ...]):
+        old_coherence, old_entropy, old_moral = old_scores
+        new_coherence, new_entropy, new_moral = self._store.scores(rows)
+        self.coherence_sum += float(np.sum(new_coherence - old_coherence))
+        self.entropy_sum += float(np.sum(new_entropy - old_entropy))
+        self.moral_sum += float(np.sum(new_moral - old_moral))
+        self.high_value_count += int(np.count_nonzero(new_moral > self.HIGH_VALUE_THRESHOLD) -
+                                     np.count_nonzero(old_moral > self.HIGH_VALUE_THRESHOLD))
+        self._updates += len(rows)
+
+
+class ContentIndex(StoreObserver):
+    """
+    Content-addressed index from event content to the row holding it
+    
+    Content is keyed by a BLAKE2b digest of its pickled bytes, so two
+    arrivals are duplicates when they pickle identically. The buffer
+    assigns the digest it looked up to each row it inserts; rows added any
+    other way (loaded, replayed, or given new content) are hashed lazily
+    on the next lookup.
+    """
+    
+    DIGEST_SIZE = 16
+    
+    def __init__(self, store: EventStore):
+        self._store = store
+        self._rows: Dict[bytes, int] = {}
+        self._digests: Dict[int, bytes] = {}
+        self._unhashed = set(store.rows().tolist())
+    
+    def __len__(self) -> int:
+        return len(self._digests) + len(self._unhashed)
+    
+    @classmethod
+    def digest(cls, content: Any) -> bytes:
+        """Digest identifying a content object"""
+        return cls._hash(pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL))
+    
+    def find(self, digest: bytes) -> Optional[int]:
+        """Row holding content with the given digest, if any"""
+        if self._unhashed:
+            self._hash_pending()
+        return self._rows.get(digest)
+    
+    def assign(self, row: int, digest: bytes):
+        """Record the digest of a row's content"""
+        self._unhashed.discard(row)
+        self._digests[row] = digest
+        self._rows[digest] = row
+    
+    def _hash_pending(self):
+        """Hash rows added without a digest, oldest first"""
+        store = self._store
+        for row in sorted(self._unhashed, key=store.seq.__getitem__):
+            self.assign(row, self._hash(store.content_bytes(row)))
+    
+    @classmethod
+    def _hash(cls, raw: bytes) -> bytes:
+        return hashlib.blake2b(raw, digest_size=cls.DIGEST_SIZE).digest()
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        self._unhashed.add(row)
+    
+    def row_removed(self, row: int):
+        self._unhashed.discard(row)
+        digest = self._digests.pop(row, None)
+        if digest is not None and self._rows.get(digest) == row:
+            del self._rows[digest]
+    
+    def content_changed(self, row: int):
+        self.row_removed(row)
+        self._unhashed.add(row)
+
+
+class TimingWheel(StoreObserver):
+    """
+    Hierarchical timing wheel that expires store rows after a time-to-live
+    
+    A row's deadline is its timestamp (or its latest access, with key
+    'last_accessed') plus `ttl`. Rows are filed by deadline tick in LEVELS
+    wheels of SLOTS slots, level k's slots spanning SLOTS**k ticks. Each
+    tick empties one level-0 slot, and every SLOTS**k ticks one level-k
+    slot is cascaded into the levels below, so expiry costs amortized O(1)
+    per row instead of a scan. Deadlines only move later, so a row
+    refreshed since it was filed is re-filed rather than expired when its
+    slot comes up.
+    """
+    
+    SLOTS = 64
+    LEVELS = 4
+    KEYS = ('timestamp', 'last_accessed')
+    
+    _SHIFT = 6  # log2(SLOTS)
+    
+    def __init__(self, store: EventStore, ttl: float, key: str = 'timestamp', tick: float = None):
+        """
+        Args:
+            store: Store whose rows expire
+            ttl: Seconds a row lives past its key time
+            key: 'timestamp' or 'last_accessed'
+            tick: Wheel resolution in seconds (defaults to ttl / SLOTS)
+        """
+        if key not in self.KEYS:
+            raise ValueError(f"key must be one of {self.KEYS}")
+        self._store = store
+        self.ttl = ttl
+        self.key = key
+        self.tick = tick or ttl / self.SLOTS
+        self._wheels = [[set() for _ in range(self.SLOTS)] for _ in range(self.LEVELS)]
+        self._where = array('q', [-1]) * store.capacity  # level * SLOTS + slot, -1 if not filed
+        self._size = 0
+        self._now = math.floor(time.time() / self.tick)  # Last tick processed
+        
+        # Filed on first use when attached to a store that already holds rows
+        self._stale = len(store) > 0
+    
+    def __len__(self) -> int:
+        return len(self._store) if self._stale else self._size
+    
+    def deadlines(self, rows) -> Any:
+        """Expiry time of a row or array of rows"""
+        store = self._store
+        reference = store.timestamp[rows]
+        if self.key == 'last_accessed':
+            reference = np.maximum(reference, store.last_accessed[rows])
+        return reference + self.ttl
+    
+    def due(self, now: float) -> bool:
+        """Whether advance(now) has ticks to process"""
+        return math.floor(now / self.tick) > self._now and len(self) > 0
+    
+    def advance(self, now: float) -> List[int]:
+        """
+        Move the clock forward to `now`
+        
+        Args:
+            now: Current time in seconds
+            
+        Returns:
+            Rows whose deadline has passed, earliest inserted first; they
+            stay in the store for the caller to release
+        """
+        if self._stale:
+            self._rebuild()
+        target = math.floor(now / self.tick)
+        expired = []
+        while self._now < target and self._size:
+            self._now += 1
+            tick = self._now
+            level = 1
+            while level < self.LEVELS and tick & ((1 << (self._SHIFT * level)) - 1) == 0:
+                level += 1
+            for cascade_level in range(level - 1, 0, -1):
+                for row in self._take(cascade_level, (tick >> (self._SHIFT * cascade_level)) & (self.SLOTS - 1)):
+                    self._file(row, tick)
+            
+            for row in self._take(0, tick & (self.SLOTS - 1)):
+                if self.deadlines(row) <= now:
+                    expired.append(row)
+                else:
+                    self._file(row)
+        self._now = max(self._now, target)
+        
+        expired.sort(key=self._store.seq.__getitem__)
+        return expired
+    
+    def _file(self, row: int, earliest: int = None):
+        """Place a row in the slot of its deadline tick, or of `earliest` if that is later"""
+        if earliest is None:
+            earliest = self._now + 1
+        due = max(math.ceil(self.deadlines(row) / self.tick), earliest)
+        
+        # The highest digit where the due tick differs from the clock picks the level
+        level = max((due ^ self._now).bit_length() - 1, 0) // self._SHIFT
+        if level < self.LEVELS:
+            slot = (due >> (self._SHIFT * level)) & (self.SLOTS - 1)
+        else:
+            # Beyond the top level: top slot 0 cascades when the clock next
+            # wraps past it, at which point the row is re-filed
+            level, slot = self.LEVELS - 1, 0
+        self._wheels[level][slot].add(row)
+        self._where[row] = level * self.SLOTS + slot
+        self._size += 1
+    
+    def _take(self, level: int, slot: int) -> set:
+        """Empty a slot, returning its rows"""
+        rows = self._wheels[level][slot]
+        self._wheels[level][slot] = set()
+        for row in rows:
+            self._where[row] = -1
+        self._size -= len(rows)
+        return rows
+    
+    def _rebuild(self):
+        """File every stored row"""
+        self._stale = False
+        for row in self._store.rows().tolist():
+            self._file(row)
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        if not self._stale:
+            self._file(row)
+    
+    def row_removed(self, row: int):
+        where = self._where[row]
+        if where >= 0:
+            self._wheels[where // self.SLOTS][where % self.SLOTS].discard(row)
+            self._where[row] = -1
+            self._size -= 1
+    
+    def store_grown(self, capacity: int):
+        self._where.extend(array('q', [-1]) * (capacity - len(self._where)))
+
+
+class Journal(StoreObserver):
+    """
+    Append-only write-ahead journal of SpiralBuffer mutations
+    
+    Logs row-level redo records in a compact binary format: insertions
+    (with pickled content), evictions, score rewrites, recall access updates,
+    settling of deferred updates and duplicate merges. Every buffer operation ends with a
+    STATE record holding the buffer's scalar state and a log sequence number
+    (LSN), which commits the records before it; replay applies whole
+    transactions only, so a torn tail is discarded.
+    
+    Committed transactions reach the file in groups of `group_commit` and
+    are made durable according to the `fsync` policy:
+    
+    - 'always': fsync after every group write
+    - 'interval': fsync at a group write once `fsync_interval` seconds have
+      passed since the previous fsync
+    - 'never': leave write-back to the operating system
+    """
+    
+    MAGIC = b'SPJ1'
+    FSYNC_POLICIES = ('always', 'interval', 'never')
+    
+    # Record types
+    ADD, EVICT, RESCORE, ACCESS, SETTLE, STATE, MERGE = range(1, 8)
+    
+    _HEADER = struct.Struct('<BII')        # Type, payload length, CRC-32 of payload
+    _ADD = struct.Struct('<q6d2q')         # Row, timestamp, phase, scores, resonance, seq, epoch
+    _ROW = struct.Struct('<q')
+    _COUNT = struct.Struct('<I')
+    _ACCESS = struct.Struct('<dI')         # Timestamp, row count
+    _STATE = struct.Struct('<qddqdqqIII')  # LSN, phase, frequency, cycles, momentum, epochs, counts
+    _INTERVENTION = struct.Struct('<ddq')  # Timestamp, phase, events affected
+    _MERGE = struct.Struct('<qdq')         # Row, timestamp, duplicate count
+    
+    def __init__(self, 
+                 path: str, 
+                 group_commit: int = 1, 
+                 fsync: str = 'interval',
+                 fsync_interval: float = 1.0):
+        """
+        Open a journal for appending, discarding any incomplete tail
+        
+        Args:
+            path: Journal file (created if missing)
+            group_commit: Number of transactions written to the file at once
+            fsync: Durability policy, one of FSYNC_POLICIES
+            fsync_interval: Minimum seconds between fsyncs under 'interval'
+        """
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {self.FSYNC_POLICIES}")
+        self.path = path
+        self.group_commit = max(1, group_commit)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        
+        transactions, end = self.read(path)
+        self.lsn = transactions[-1][0]['lsn'] if transactions else 0
+        if end:
+            self._file = open(path, 'r+b')
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(self.MAGIC)
+        
+        self._buffer = bytearray()
+        self._committed = 0        # Bytes of _buffer holding complete transactions
+        self._group = 0            # Complete transactions in _buffer
+        self._last_sync = time.monotonic()
+        self._pending_add = None
+        self._store = None
+        self._phases_logged = 0
+        self._history_logged = 0
+        self._interventions_logged = 0
+    
+    @classmethod
+    def read(cls, path: str) -> Tuple[List[Tuple[Dict, List[Tuple]]], int]:
+        """
+        Decode the complete transactions in a journal file
+        
+        Args:
+            path: Journal file
+            
+        Returns:
+            (transactions, end): (state, records) pairs in commit order, and
+            the file offset just past the last complete transaction (0 if the
+            file is missing or empty)
+        """
+        if not os.path.exists(path):
+            return [], 0
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data:
+            return [], 0
+        if data[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError(f"Not a SpiralBuffer journal: {path}")
+        
+        transactions, records = [], []
+        offset = end = len(cls.MAGIC)
+        while offset + cls._HEADER.size <= len(data):
+            kind, length, checksum = cls._HEADER.unpack_from(data, offset)
+            start = offset + cls._HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            offset = start + length
+            
+            if kind == cls.STATE:
+                transactions.append((cls._decode_state(payload), records))
+                records = []
+                end = offset
+            else:
+                records.append(cls._decode(kind, payload))
+        return transactions, end
+    
+    def bind(self, buffer: 'SpiralBuffer'):
+        """Start logging a buffer's mutations, continuing from its LSN"""
+        if self.lsn > buffer._journal_lsn:
+            raise ValueError("Journal is ahead of the buffer; open it with SpiralBuffer.recover()")
+        self.lsn = buffer._journal_lsn
+        self._store = buffer._store
+        self._store.add_observer(self)
+        self._phases_logged = buffer._store.epoch
+        self._history_logged = buffer._history_count
+        self._interventions_logged = len(buffer.monitor.interventions)
+    
+    def unbind(self):
+        """Stop observing the bound buffer's store"""
+        if self._store is not None:
+            self._emit_pending_add()
+            self._store.remove_observer(self)
+            self._store = None
+    
+    def log_access(self, rows: np.ndarray, timestamp: float):
+        """Record a recall access update"""
+        rows = np.asarray(rows, dtype=np.int64)
+        self._append(self.ACCESS, self._ACCESS.pack(timestamp, len(rows)) + rows.tobytes())
+    
+    def log_settle(self, rows: np.ndarray):
+        """Record the applied epochs of rows brought up to date"""
+        store = self._store
+        rows = np.asarray(rows, dtype=np.int64)
+        self._append(self.SETTLE, 
+                     self._COUNT.pack(len(rows)) + rows.tobytes() + store.applied_epoch[rows].tobytes())
+    
+    def log_merge(self, row: int):
+        """Record the timestamp and duplicate count of a row duplicates were merged into"""
+        store = self._store
+        self._append(self.MERGE, self._MERGE.pack(row, store.timestamp[row], store.duplicate_count[row]))
+    
+    def commit(self, buffer: 'SpiralBuffer'):
+        """Close the open transaction with the bound buffer's current scalar state"""
+        self._emit_pending_add()
+        self.lsn += 1
+        store = self._store
+        history_added = min(buffer._history_count - self._history_logged, len(buffer.coherence_history))
+        self._history_logged = buffer._history_count
+        # Epochs trimmed before this commit were settled by every row and are not logged
+        phases = buffer._reinforcement_phases[max(self._phases_logged - buffer._phase_base, 0):]
+        interventions = buffer.monitor.interventions.since(self._interventions_logged)
+        self._phases_logged = store.epoch
+        self._interventions_logged = len(buffer.monitor.interventions)
+        
+        history = list(buffer.coherence_history)[len(buffer.coherence_history) - history_added:]
+        history += list(buffer.entropy_history)[len(buffer.entropy_history) - history_added:]
+        payload = [
+            self._STATE.pack(self.lsn, buffer.current_phase, buffer.update_frequency, buffer.cycle_count,
+                             buffer.moral_momentum, store.epoch, store.settled_epoch,
+                             history_added, len(phases), len(interventions)),
+            np.asarray(history + phases, dtype=np.float64).tobytes(),
+        ]
+        for intervention in interventions:
+            payload.append(self._INTERVENTION.pack(
+                intervention['timestamp'], intervention['phase'], intervention['events_affected']))
+        self._append(self.STATE, b''.join(payload))
+        
+        self._committed = len(self._buffer)
+        self._group += 1
+        if self._group >= self.group_commit:
+            self.flush()
+    
+    def flush(self, sync: bool = False):
+        """
+        Write committed transactions to the file
+        
+        Args:
+            sync: fsync regardless of the fsync policy
+        """
+        if self._committed:
+            self._file.write(self._buffer[:self._committed])
+            del self._buffer[:self._committed]
+            self._committed = 0
+            self._group = 0
+        self._file.flush()
+        
+        now = time.monotonic()
+        if sync or self.fsync == 'always' or (
+                self.fsync == 'interval' and now - self._last_sync >= self.fsync_interval):
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+    
+    def reset(self):
+        """Drop all records after a snapshot has captured them (the LSN carries on)"""
+        self.flush(sync=True)
+        staging = self.path + '.tmp'
+        with open(staging, 'wb') as f:
+            f.write(self.MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(staging, self.path)
+        self._file = open(self.path, 'r+b')
+        self._file.seek(0, os.SEEK_END)
+    
+    def close(self):
+        """Flush and fsync committed transactions and close the file"""
+        self.unbind()
+        self.flush(sync=True)
+        self._file.close()
+    
+    # Store observer interface
+    
+    def row_added(self, row: int):
+        # Logged once the buffer has finished initializing the row
+        self._emit_pending_add()
+        self._pending_add = row
+    
+    def row_removed(self, row: int):
+        self._append(self.EVICT, self._ROW.pack(row))
+    
+    def row_rescored(self, row: int, old_scores: Tuple[float, float, float]):
+        self.rows_rescored(np.array([row], dtype=np.int64), old_scores)
+    
+    def rows_rescored(self, rows: np.ndarray, old_scores: Tuple[np.ndarray, np.ndarray, np.ndarray]):
+        store = self._store
+        rows = np.asarray(rows, dtype=np.int64)
+        payload = [self._COUNT.pack(len(rows)), rows.tobytes()]
+        payload += [column.tobytes() for column in store.scores(rows)]
+        self._append(self.RESCORE, b''.join(payload))
+    
+    # Encoding
+    
+    def _append(self, kind: int, payload: bytes):
+        """Add a record to the open transaction"""
+        if kind != self.ADD:
+            self._emit_pending_add()
+        self._buffer += self._HEADER.pack(kind, len(payload), zlib.crc32(payload))
+        self._buffer += payload
+    
+    def _emit_pending_add(self):
+        """Write the ADD record of the most recently allocated row"""
+        row, self._pending_add = self._pending_add, None
+        if row is None:
+            return
+        store = self._store
+        fixed = self._ADD.pack(row, store.timestamp[row], store.phase[row], store.coherence_score[row],
+                               store.entropy_score[row], store.moral_value[row], 
+                               store.harmonic_resonance[row], store.seq[row], store.applied_epoch[row])
+        self._append(self.ADD, fixed + store.content_bytes(row))
+    
+    @classmethod
+    def _decode(cls, kind: int, payload: bytes) -> Tuple:
+        """Record tuple for a non-STATE payload"""
+        if kind == cls.ADD:
+            return (kind,) + cls._ADD.unpack_from(payload) + (payload[cls._ADD.size:],)
+        if kind == cls.EVICT:
+            return (kind,) + cls._ROW.unpack(payload)
+        if kind == cls.MERGE:
+            return (kind,) + cls._MERGE.unpack(payload)
+        if kind == cls.ACCESS:
+            timestamp, count = cls._ACCESS.unpack_from(payload)
+            return kind, np.frombuffer(payload, np.int64, count, cls._ACCESS.size), timestamp
+        
+        count, = cls._COUNT.unpack_from(payload)
+        columns = [np.frombuffer(payload, np.int64, count, cls._COUNT.size)]
+        dtypes = (np.int64,) if kind == cls.SETTLE else (np.float64,) * 3
+        for index, dtype in enumerate(dtypes):
+            columns.append(np.frombuffer(payload, dtype, count, cls._COUNT.size + 8 * count * (index + 1)))
+        return (kind,) + tuple(columns)
+    
+    @classmethod
+    def _decode_state(cls, payload: bytes) -> Dict:
+        """State dictionary for a STATE payload"""
+        (lsn, current_phase, update_frequency, cycle_count, moral_momentum, epoch, settled_epoch,
+         history_count, phase_count, intervention_count) = cls._STATE.unpack_from(payload)
+        values = np.frombuffer(payload, np.float64, 2 * history_count + phase_count, cls._STATE.size)
+        offset = cls._STATE.size + 8 * len(values)
+        interventions = []
+        for index in range(intervention_count):
+            timestamp, phase, affected = cls._INTERVENTION.unpack_from(
+                payload, offset + index * cls._INTERVENTION.size)
+            interventions.append({'timestamp': timestamp, 'phase': phase, 'events_affected': affected})
+        
+        return {
+            'lsn': lsn,
+            'current_phase': current_phase,
+            'update_frequency': update_frequency,
+            'cycle_count': cycle_count,
+            'moral_momentum': moral_momentum,
+            'epoch': epoch,
+            'settled_epoch': settled_epoch,
+            'coherence_history': values[:history_count].tolist(),
+            'entropy_history': values[history_count:2 * history_count].tolist(),
+            'reinforcement_phases': values[2 * history_count:].tolist(),
+            'interventions': interventions,
+        }
 
 
-@dataclass
 class MemoryEvent:
-    """Individual memory unit with embedded morality metrics"""
-    content: Any
-    timestamp: float
-    phase: float  # Position in spiral buffer (0-2π)
-    coherence_score: float = 0.0  # ζ - promotes order/beneficial outcomes
-    entropy_score: float = 0.0    # S - introduces disorder/harmful effects  
-    moral_value: float = 0.0      # M = ζ - S (calculated automatically)
-    access_count: int = 0
-    last_accessed: float = 0.0
-    harmonic_resonance: float = 0.0
-    
-    def __post_init__(self):
-        self.moral_value = self.coherence_score - self.entropy_score
+    """
+    Individual memory unit with embedded morality metrics
+    
+    Events held by a SpiralBuffer are lightweight views over a row of the
+    buffer's EventStore. Constructing a MemoryEvent directly creates a
+    standalone event backed by its own single-row store.
+    """
+    
+    __slots__ = ('_store', '_row', '__weakref__')
+    
+    _FIELD_NAMES = ('content', 'timestamp', 'phase', 'coherence_score', 'entropy_score',
+                    'moral_value', 'access_count', 'last_accessed', 'harmonic_resonance',
+                    'duplicate_count')
+    
+    def __init__(self, 
+                 content: Any, 
+                 timestamp: float, 
+                 phase: float,
+                 coherence_score: float = 0.0,
+                 entropy_score: float = 0.0,
+                 moral_value: float = 0.0,  # M = ζ - S (calculated automatically)
+                 access_count: int = 0,
+                 last_accessed: float = 0.0,
+                 harmonic_resonance: float = 0.0,
+                 duplicate_count: int = 0):
+        store = EventStore(1)
+        row = store.allocate(content, timestamp, phase, coherence_score, entropy_score)
+        store.access_count[row] = access_count
+        store.last_accessed[row] = last_accessed
+        store.harmonic_resonance[row] = harmonic_resonance
+        store.duplicate_count[row] = duplicate_count
+        self._store = store
+        self._row = row
+        store._views[row] = self
+    
+    @classmethod
+    def _bind(cls, store: EventStore, row: int) -> 'MemoryEvent':
+        """Create a view over an existing store row"""
+        event = cls.__new__(cls)
+        event._store = store
+        event._row = row
+        return event
+    
+    def _detach(self):
+        """Copy this event's row into a private store before the row is recycled"""
+        store, row = self._store, self._row
+        standalone = EventStore(1)
+        new_row = standalone.allocate(store.content[row], store.timestamp[row], store.phase[row],
+                                      store.coherence_score[row], store.entropy_score[row])
+        for name in EventStore.FIELDS:
+            getattr(standalone, name)[new_row] = getattr(store, name)[row]
+        standalone.harmonic_resonance[new_row] = store.resonance(row)
+        self._store = standalone
+        self._row = new_row
+        standalone._views[new_row] = self
+    
+    @property
+    def content(self) -> Any:
+        return self._store.content[self._row]
+    
+    @content.setter
+    def content(self, value: Any):
+        self._store.set_content(self._row, value)
+    
+    timestamp = _event_field('timestamp', float)
+    phase = _event_field('phase', float)
+    coherence_score = _event_field('coherence_score', float)
+    entropy_score = _event_field('entropy_score', float)
+    moral_value = _event_field('moral_value', float)
+    access_count = _event_field('access_count', int)
+    last_accessed = _event_field('last_accessed', float)
+    duplicate_count = _event_field('duplicate_count', int)
+    
+    @property
+    def harmonic_resonance(self) -> float:
+        return self._store.resonance(self._row)
+    
+    @harmonic_resonance.setter
+    def harmonic_resonance(self, value: float):
+        self._store.set_resonance(self._row, value)
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._FIELD_NAMES)
+        return f'MemoryEvent({fields})'
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELD_NAMES)
+    
+    __hash__ = None
     
     def update_morality(self, coherence: float, entropy: float):
         """Update morality scores and recalculate moral value"""
-        self.coherence_score = coherence
-        self.entropy_score = entropy
-        self.moral_value = coherence - entropy
+        self._store.update_morality(self._row, coherence, entropy)
     
     def phase_distance(self, other_phase: float) -> float:
         """Calculate shortest angular distance between phases"""
@@ -44,40 +2224,335 @@ class MemoryEvent:
         return min(diff, 2 * math.pi - diff)
 
 
+class InterventionLog:
+    """
+    Constant-memory record of coherence interventions
+    
+    Keeps the most recent `capacity` interventions in a ring of arrays,
+    alongside running totals and per-sector histograms of where
+    interventions were centred and how many events they touched. An
+    optional sink is called with every intervention as it is recorded, to
+    stream the full history elsewhere. len() counts every intervention
+    ever recorded; iteration yields the retained ones, oldest first, as
+    dicts.
+    """
+    
+    def __init__(self, capacity: int = 1024, sectors: int = 32, sink: Callable[[Dict], None] = None):
+        """
+        Args:
+            capacity: Number of recent interventions retained
+            sectors: Phase sectors in the histograms
+            sink: Called with each intervention dict as it is recorded
+        """
+        self.capacity = capacity
+        self.sectors = sectors
+        self.sink = sink
+        self.timestamp = np.zeros(capacity, dtype=np.float64)
+        self.phase = np.zeros(capacity, dtype=np.float64)
+        self.events_affected = np.zeros(capacity, dtype=np.int64)
+        
+        self.total = 0
+        self.events_affected_total = 0
+        self.sector_counts = np.zeros(sectors, dtype=np.int64)
+        self.sector_events = np.zeros(sectors, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return self.total
+    
+    def __iter__(self):
+        return iter(self.since(0))
+    
+    def record(self, timestamp: float, phase: float, events_affected: int):
+        """Add an intervention to the ring, totals and histograms, and pass it to the sink"""
+        entry = {'timestamp': timestamp, 'phase': phase, 'events_affected': events_affected}
+        self._write(self.total, entry)
+        self.total += 1
+        self.events_affected_total += events_affected
+        sector = self.sector(phase)
+        self.sector_counts[sector] += 1
+        self.sector_events[sector] += events_affected
+        if self.sink is not None:
+            self.sink(entry)
+    
+    def extend(self, interventions: List[Dict]):
+        """Record several intervention dicts in order"""
+        for entry in interventions:
+            self.record(entry['timestamp'], entry['phase'], entry['events_affected'])
+    
+    def since(self, index: int) -> List[Dict]:
+        """Retained interventions numbered `index` onwards (counting from the first ever recorded)"""
+        start = max(index, self.total - self.capacity, 0)
+        return [self._entry(ordinal % self.capacity) for ordinal in range(start, self.total)]
+    
+    def sector(self, phase: float) -> int:
+        """Histogram sector of a phase"""
+        return int((phase % (2 * math.pi)) / (2 * math.pi) * self.sectors) % self.sectors
+    
+    def get_state(self) -> Dict:
+        """Retained interventions, totals and histograms"""
+        return {
+            'capacity': self.capacity,
+            'sectors': self.sectors,
+            'total': self.total,
+            'events_affected_total': self.events_affected_total,
+            'sector_counts': self.sector_counts.tolist(),
+            'sector_events': self.sector_events.tolist(),
+            'recent': self.since(0),
+        }
+    
+    def set_state(self, state):
+        """Restore state saved by get_state (or a plain list of intervention dicts)"""
+        if isinstance(state, list):
+            self.extend(state)
+            return
+        self.__init__(state['capacity'], state['sectors'], self.sink)
+        self.total = state['total']
+        self.events_affected_total = state['events_affected_total']
+        self.sector_counts[:] = state['sector_counts']
+        self.sector_events[:] = state['sector_events']
+        for ordinal, entry in enumerate(state['recent'], self.total - len(state['recent'])):
+            self._write(ordinal, entry)
+    
+    def _write(self, ordinal: int, entry: Dict):
+        """Store an intervention in its ring slot"""
+        slot = ordinal % self.capacity
+        self.timestamp[slot] = entry['timestamp']
+        self.phase[slot] = entry['phase']
+        self.events_affected[slot] = entry['events_affected']
+    
+    def _entry(self, slot: int) -> Dict:
+        """Intervention dict for a ring slot"""
+        return {
+            'timestamp': float(self.timestamp[slot]),
+            'phase': float(self.phase[slot]),
+            'events_affected': int(self.events_affected[slot]),
+        }
+
+
 class CoherenceMonitor:
     """Automated system for detecting and correcting entropy accumulation"""
     
-    def __init__(self, intervention_threshold: float = 0.3):
+    # Phase radii inspected by threat detection and covered by stabilization
+    DETECTION_RADIUS = 0.5
+    STABILIZATION_RADIUS = 0.8
+    
+    def __init__(self, 
+                 intervention_threshold: float = 0.3, 
+                 history_size: int = 1024,
+                 sink: Callable[[Dict], None] = None):
+        """
+        Args:
+            intervention_threshold: Mean moral value below which a region is stabilized
+            history_size: Recent interventions kept in memory
+            sink: Called with every intervention as it is recorded
+        """
         self.intervention_threshold = intervention_threshold
-        self.interventions = []
+        self.interventions = InterventionLog(history_size, sink=sink)
     
     def detect_entropy_threat(self, buffer, current_phase: float) -> bool:
         """Assess if intervention is needed to maintain coherence"""
-        nearby_events = buffer.get_phase_neighbors(current_phase, radius=0.5)
-        if not nearby_events:
+        store = buffer._store
+        count, moral_sum = buffer._phase_window_totals(current_phase, self.DETECTION_RADIUS)
+        if not count or moral_sum / count >= self.intervention_threshold:
+            # Pending boosts only raise moral values, so this mean is a lower bound
             return False
+        if store.epoch == store.settled_epoch:
+            # No deferred updates pending, so the phase index's sector totals are current
+            return True
         
-        avg_morality = np.mean([event.moral_value for event in nearby_events])
+        nearby_rows = buffer._phase_neighbor_rows(current_phase, radius=self.DETECTION_RADIUS)
+        if not len(nearby_rows):
+            return False
+        buffer._store.settle_rows(nearby_rows)
+        
+        avg_morality = np.mean(buffer._store.moral_value[nearby_rows])
         return avg_morality < self.intervention_threshold
     
     def stabilize_region(self, buffer, center_phase: float, strength: float = 0.2):
         """Apply coherence reinforcement to memory region"""
-        affected_events = buffer.get_phase_neighbors(center_phase, radius=0.8)
+        store = buffer._store
+        affected_rows = buffer._phase_neighbor_rows(center_phase, radius=self.STABILIZATION_RADIUS)
+        store.settle_rows(affected_rows)
+        
+        diff = np.abs(store.phase[affected_rows] - center_phase)
+        distance = np.minimum(diff, 2 * math.pi - diff)
+        boost = strength * (1 - distance / self.STABILIZATION_RADIUS)
+        
+        # Reinforce coherence, reduce entropy
+        new_coherence = np.minimum(1.0, store.coherence_score[affected_rows] + boost)
+        new_entropy = np.maximum(0.0, store.entropy_score[affected_rows] - boost * 0.5)
+        store.update_morality_rows(affected_rows, new_coherence, new_entropy)
         
-        for event in affected_events:
-            distance = event.phase_distance(center_phase)
-            boost = strength * (1 - distance / 0.8)
+        self.interventions.record(time.time(), center_phase, len(affected_rows))
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram over integer nanoseconds
+    
+    Values below 2·SUB_BUCKETS get a bucket each; above that every power-of-two
+    range is split into SUB_BUCKETS equal buckets, so any recorded value is
+    reported within 1/SUB_BUCKETS (about 3%) of itself while the histogram
+    stays a fixed array of about a thousand counters up to MAX_VALUE.
+    """
+    
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    
+    # Largest value tracked exactly by bucket (about 18 minutes); larger values are clamped
+    MAX_VALUE = (1 << 40) - 1
+    
+    def __init__(self):
+        self.n_buckets = self.bucket(self.MAX_VALUE) + 1
+        self.counts = array('q', [0]) * self.n_buckets
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+    
+    @classmethod
+    def bucket(cls, value: int) -> int:
+        """Bucket holding a value"""
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+        return shift * cls.SUB_BUCKETS + (value >> shift)
+    
+    @classmethod
+    def bucket_range(cls, bucket: int) -> Tuple[int, int]:
+        """Lowest and highest value a bucket holds"""
+        if bucket < 2 * cls.SUB_BUCKETS:
+            return bucket, bucket
+        shift = bucket // cls.SUB_BUCKETS - 1
+        low = (bucket - shift * cls.SUB_BUCKETS) << shift
+        return low, low + (1 << shift) - 1
+    
+    def record(self, value: int):
+        """Record one value"""
+        value = min(max(value, 0), self.MAX_VALUE)
+        self.counts[self.bucket(value)] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+    
+    def percentile(self, percent: float) -> int:
+        """Highest value of the bucket holding the given percentile (0 when empty)"""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_range(bucket)[1], self.max)
+        return self.max
+    
+    def summary(self) -> Dict:
+        """Count, total and latency distribution in microseconds"""
+        return {
+            'count': self.count,
+            'total_ms': self.total / 1e6,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0.0,
+            'min_us': self.min / 1e3,
+            'p50_us': self.percentile(50) / 1e3,
+            'p90_us': self.percentile(90) / 1e3,
+            'p99_us': self.percentile(99) / 1e3,
+            'p999_us': self.percentile(99.9) / 1e3,
+            'max_us': self.max / 1e3,
+        }
+    
+    def reset(self):
+        """Forget every recorded value"""
+        self.counts = array('q', [0]) * self.n_buckets
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+
+class Instrumentation:
+    """
+    Per-stage call counters and latency histograms for a buffer's hot paths
+    
+    attach() replaces each listed method on the object itself with a timing
+    wrapper, so the class and every uninstrumented buffer are untouched and
+    pay nothing; detach() restores the plain methods. Nested stages are each
+    timed in full, e.g. add_event includes its store_event and update_metrics.
+    
+    Histograms are not thread-safe on their own; a concurrent instance
+    records, summarizes and resets under one lock so that parallel calls
+    do not lose counts.
+    """
+    
+    def __init__(self, concurrent: bool = False):
+        """
+        Args:
+            concurrent: Whether instrumented methods run on several threads at once
+        """
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._attached: List[Tuple[Any, str]] = []
+        self._lock = threading.Lock() if concurrent else None
+    
+    def attach(self, target: Any, methods: Tuple[str, ...]):
+        """Time the given methods of an object, each as a stage named without leading underscores"""
+        for name in methods:
+            stage = name.lstrip('_')
+            histogram = self.histograms.setdefault(stage, LatencyHistogram())
+            setattr(target, name, self._timed(getattr(target, name), histogram, self._lock))
+            self._attached.append((target, name))
+    
+    def detach(self):
+        """Restore every instrumented method"""
+        for target, name in self._attached:
+            target.__dict__.pop(name, None)
+        self._attached = []
+    
+    def summary(self) -> Dict[str, Dict]:
+        """Summary of every stage called at least once"""
+        with self._locked():
+            return {stage: histogram.summary() for stage, histogram in self.histograms.items() 
+                    if histogram.count}
+    
+    def reset(self):
+        """Forget every recorded call"""
+        with self._locked():
+            for histogram in self.histograms.values():
+                histogram.reset()
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the histogram lock, if there is one"""
+        if self._lock is None:
+            yield
+        else:
+            with self._lock:
+                yield
+    
+    @staticmethod
+    def _timed(method: Callable, histogram: LatencyHistogram, lock: threading.Lock = None) -> Callable:
+        """Wrap a bound method to record its latency, under lock if given"""
+        clock = time.perf_counter_ns
+        record = histogram.record
+        if lock is not None:
+            unlocked = record
             
-            # Reinforce coherence, reduce entropy
-            new_coherence = min(1.0, event.coherence_score + boost)
-            new_entropy = max(0.0, event.entropy_score - boost * 0.5)
-            event.update_morality(new_coherence, new_entropy)
+            def record(value: int):
+                with lock:
+                    unlocked(value)
         
-        self.interventions.append({
-            'timestamp': time.time(),
-            'phase': center_phase,
-            'events_affected': len(affected_events)
-        })
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(clock() - start)
+        
+        timed.__name__ = method.__name__
+        timed.__doc__ = method.__doc__
+        return timed
 
 
 class SpiralBuffer:
@@ -92,10 +2567,50 @@ class SpiralBuffer:
     # Empirically-derived optimal update frequency for stability
     OPTIMAL_FREQUENCY = 432.0  # Hz
     
+    # Harmonic series tested by auto-tuning
+    TUNING_FREQUENCIES = (216, 432, 864, 1296)
+    
+    # Upper bound on kernel evaluations held in memory at once by sweeps
+    SWEEP_CHUNK_SIZE = 1 << 22
+    
+    # On-disk snapshot format written by save()
+    SNAPSHOT_VERSION = 1
+    
+    # Unsettled reinforcement epochs kept before lazy mode settles every row
+    REINFORCEMENT_PHASE_LIMIT = 1024
+    
+    # How a duplicate arrival updates the stored event (see deduplicate)
+    MERGE_POLICIES = ('count', 'refresh', 'replace', 'mean')
+    
+    # Methods timed by instrumentation: public operations, then add_event's stages
+    INSTRUMENTED_METHODS = ('add_event', 'add_events', 'recall_by_coherence', 'recall_similar',
+                            'get_phase_neighbors', 'auto_tune_frequency', 'expire',
+                            '_store_event', '_evict_lowest', '_advance_phase', '_update_metrics',
+                            '_check_coherence', '_reinforce_coherent_memories')
+    MONITOR_INSTRUMENTED_METHODS = ('detect_entropy_threat', 'stabilize_region')
+    
     def __init__(self, 
                  max_capacity: int = 1000, 
                  update_frequency: float = None,
-                 coherence_threshold: float = 0.5):
+                 coherence_threshold: float = 0.5,
+                 harmonic_table_size: int = None,
+                 lazy_reinforcement: bool = False,
+                 metrics_recompute_interval: int = None,
+                 compact_content: bool = False,
+                 deduplicate: bool = False,
+                 merge_policy: str = 'refresh',
+                 ttl: float = None,
+                 expire_by: str = 'timestamp',
+                 expiry_tick: float = None,
+                 decay_interval: float = None,
+                 recall_index: bool = False,
+                 embedding_dim: int = None,
+                 featurizer: Callable[[Any], np.ndarray] = None,
+                 ivf_lists: int = None,
+                 ivf_probe: int = 8,
+                 recall_cache_size: int = 128,
+                 recall_cache_resolution: float = None,
+                 instrumented: bool = False):
         """
         Initialize spiral buffer with specified parameters
         
@@ -103,19 +2618,103 @@ class SpiralBuffer:
             max_capacity: Maximum number of events to store
             update_frequency: Update rate in Hz (defaults to optimal 432 Hz)
             coherence_threshold: Minimum coherence for auto-tuning
+            harmonic_table_size: Use a HarmonicTable with this many intervals
+                for harmonic resonance instead of evaluating exp (default off)
+            lazy_reinforcement: Record cycle-end reinforcement epochs and apply
+                each event's pending boosts only when it is next read, evicted
+                or reported on, instead of sweeping the buffer at cycle end
+            metrics_recompute_interval: Rebuild the running metric sums exactly
+                after this many updates to bound floating-point drift
+                (default never)
+            compact_content: Keep event content pickled in a ContentStore
+                arena instead of as live objects, trading an unpickle per
+                content read for memory (buffers restored by load() keep
+                content in the snapshot's blob either way)
+            deduplicate: Index content by hash and fold an arrival whose
+                content is already stored into the stored event, bumping its
+                duplicate_count, instead of inserting a new event
+            merge_policy: What a folded duplicate updates besides the count:
+                'count' nothing, 'refresh' the timestamp, 'replace' the
+                timestamp and scores (taking the new ones), 'mean' the
+                timestamp and scores (averaging over all arrivals)
+            ttl: Expire events this many seconds after their `expire_by`
+                time, through a TimingWheel advanced by each operation
+                (default never)
+            expire_by: 'timestamp' to age events from insertion,
+                'last_accessed' from their latest recall (or insertion)
+            expiry_tick: Expiry resolution in seconds (defaults to ttl / 64)
+            decay_interval: Scale harmonic resonance by resonance_decay for
+                every this many seconds since the `expire_by` time, computed
+                when the resonance is read (default no decay)
+            recall_index: Answer recall from a RecallIndex over (phase,
+                coherence) instead of scoring every event; same results,
+                and far faster recall on large buffers, but every insert
+                and eviction updates the index (about 20 us, a quarter of
+                add_event into a full 100k buffer; default off)
+            embedding_dim: Keep a float32 content embedding of this many
+                dimensions per event for recall_similar (default off)
+            featurizer: Callable mapping content to an embedding_dim vector
+                (defaults to a HashingFeaturizer)
+            ivf_lists: Narrow recall_similar with an inverted file of this
+                many k-means lists, trained once the buffer holds enough
+                events (default exact scan)
+            ivf_probe: Inverted-file lists recall_similar scans per query
+            recall_cache_size: Recall results kept in an LRU RecallCache,
+                reused until the buffer next changes (0 disables)
+            recall_cache_resolution: Round recall targets to multiples of
+                this before ranking, so nearby targets share cache entries
+                (default exact targets)
+            instrumented: Count calls and record latency histograms for the
+                hot paths in INSTRUMENTED_METHODS (see
+                get_performance_metrics); off costs nothing
         """
+        if merge_policy not in self.MERGE_POLICIES:
+            raise ValueError(f"merge_policy must be one of {self.MERGE_POLICIES}")
+        if expire_by not in TimingWheel.KEYS:
+            raise ValueError(f"expire_by must be one of {TimingWheel.KEYS}")
+        if featurizer is not None and not embedding_dim:
+            raise ValueError("featurizer requires embedding_dim")
         self.max_capacity = max_capacity
         self.update_frequency = update_frequency or self.OPTIMAL_FREQUENCY
         self.coherence_threshold = coherence_threshold
+        self.harmonic_table = HarmonicTable(harmonic_table_size) if harmonic_table_size else None
+        
+        self.lazy_reinforcement = lazy_reinforcement
+        self.metrics_recompute_interval = metrics_recompute_interval
+        self.compact_content = compact_content
+        self.deduplicate = deduplicate
+        self.merge_policy = merge_policy
+        self.ttl = ttl
+        self.expire_by = expire_by
+        self.expiry_tick = expiry_tick
+        self.decay_interval = decay_interval
+        self.recall_index = recall_index
+        self.embedding_dim = embedding_dim
+        self.featurizer = featurizer or (HashingFeaturizer(embedding_dim) if embedding_dim else None)
+        self.ivf_lists = ivf_lists
+        self.ivf_probe = ivf_probe
+        self.recall_cache_size = recall_cache_size
+        self.recall_cache_resolution = recall_cache_resolution
         
-        # Core memory storage
-        self.events: List[MemoryEvent] = []
+        # Core memory storage (one spare row holds the overflow event before eviction)
+        content = PackedContent(max_capacity + 1) if compact_content else None
+        self._attach_store(EventStore(max_capacity + 1, content=content))
+        
+        # Phases of cycle-end reinforcement epochs from _phase_base onwards, trimmed
+        # once every row has settled past them
+        self._reinforcement_phases: List[float] = []
+        self._phase_base = 0
+        
+        # Optional write-ahead journal and the last LSN it committed
+        self._journal: Optional[Journal] = None
+        self._journal_lsn = 0
         self.current_phase = 0.0
         self.cycle_count = 0
         
         # Performance monitoring
         self.coherence_history = deque(maxlen=100)
         self.entropy_history = deque(maxlen=100)
+        self._history_count = 0  # Entries ever appended to the histories
         self.moral_momentum = 0.0
         
         # Automated coherence maintenance
@@ -124,6 +2723,42 @@ class SpiralBuffer:
         # System parameters
         self.phase_momentum = 0.0
         self.resonance_decay = 0.95
+        
+        # Optional hot-path timing
+        self._instrumentation: Optional[Instrumentation] = None
+        self.set_instrumented(instrumented)
+    
+    def __len__(self) -> int:
+        return len(self._store)
+    
+    def _attach_store(self, store: EventStore):
+        """Adopt an event store and build the indexes that observe it"""
+        self._store = store
+        self._eviction_heap = MoralHeap(store)
+        self._phase_index = PhaseIndex(store)
+        self._aggregates = MoralAggregates(store, self.metrics_recompute_interval)
+        self._content_index = ContentIndex(store) if self.deduplicate else None
+        self._expiry = TimingWheel(store, self.ttl, self.expire_by, self.expiry_tick) if self.ttl else None
+        self._recall_index = RecallIndex(store) if self.recall_index else None
+        self._embedding_index = (EmbeddingIndex(store, self.featurizer, self.embedding_dim, 
+                                                self.ivf_lists, self.ivf_probe)
+                                 if self.embedding_dim else None)
+        self._recall_cache = RecallCache(store, self.recall_cache_size) if self.recall_cache_size else None
+        store.add_observer(self._eviction_heap)
+        store.add_observer(self._phase_index)
+        store.add_observer(self._aggregates)
+        for index in (self._content_index, self._expiry, self._recall_index, self._embedding_index, 
+                      self._recall_cache):
+            if index is not None:
+                store.add_observer(index)
+        store.settle = self._settle
+        store.decay_factors = self._decay_factors if self.decay_interval else None
+    
+    @property
+    def events(self) -> List[MemoryEvent]:
+        """Stored events in insertion order"""
+        store = self._store
+        return [store.view(row) for row in store.iter_rows()]
     
     def add_event(self, 
                   content: Any, 
@@ -138,92 +2773,300 @@ class SpiralBuffer:
             entropy: Score (0-1) for how much this introduces disorder/harmful effects
             
         Returns:
-            MemoryEvent: The created event with calculated moral value
+            MemoryEvent: The created event with calculated moral value (with
+            deduplication, the stored event a duplicate was merged into)
         """
-        # Create new memory event
-        event = MemoryEvent(
-            content=content,
-            timestamp=time.time(),
-            phase=self.current_phase,
-            coherence_score=coherence,
-            entropy_score=entropy
-        )
+        store = self._store
+        self._expire_due()
         
-        # Calculate harmonic resonance with recent events
-        if self.events:
-            recent_events = self.events[-min(10, len(self.events)):]
-            resonances = [self._harmonic_weight(e.phase, event.phase) for e in recent_events]
-            event.harmonic_resonance = np.mean(resonances)
+        # Fold duplicate content into the stored event
+        index = self._content_index
+        if index is not None:
+            digest = index.digest(content)
+            row = index.find(digest)
+            if row is not None:
+                self._merge_duplicate(row, coherence, entropy, time.time())
+                self._journal_commit()
+                return store.view(row)
         
-        self.events.append(event)
+        # Create new memory event
+        row = self._store_event(content, coherence, entropy)
+        if index is not None:
+            index.assign(row, digest)
+        event = store.view(row)
         
         # Manage capacity by removing lowest-value memories (not oldest)
-        if len(self.events) > self.max_capacity:
-            self.events.sort(key=lambda e: e.moral_value)
-            self.events = self.events[1:]
+        if len(store) > self.max_capacity:
+            self._evict_lowest()
         
         # Update system state
         self._advance_phase()
         self._update_metrics(event)
         
         # Check for automatic coherence intervention
-        if self.monitor.detect_entropy_threat(self, self.current_phase):
-            self.monitor.stabilize_region(self, self.current_phase)
+        self._check_coherence(self.current_phase)
         
+        self._journal_commit()
         return event
     
+    def add_events(self, 
+                   contents: List[Any], 
+                   coherences: List[float], 
+                   entropies: List[float]) -> List[MemoryEvent]:
+        """
+        Add a burst of events in a single pass
+        
+        Equivalent to calling add_event for each item in order, except:
+        
+        - Phases are computed in closed form (start + i·Δ mod 2π), which can
+          differ from sequentially accumulated phases in the last few ulps.
+        - Cycle-end reinforcement runs once per completed cycle after the
+          batch is stored, at the phase where that cycle ended, so it also
+          sees batch events inserted after the cycle boundary.
+        - The coherence monitor runs once per phase region of width
+          CoherenceMonitor.DETECTION_RADIUS that the batch touched, at the
+          last phase reached inside that region, after the batch is stored.
+        - With deduplication, duplicates of stored content are merged before
+          anything is inserted, and later copies of content new in the
+          batch are merged into its first copy before that is inserted.
+        
+        Evictions, harmonic resonance and the coherence/entropy history are
+        derived from the scores as they stand when the call starts; they
+        differ from sequential insertion only where the deferred monitor or
+        reinforcement passes would have rescored events mid-batch.
+        
+        Args:
+            contents: The data/information to store, one item per event
+            coherences: Coherence score (0-1) for each event
+            entropies: Entropy score (0-1) for each event
+            
+        Returns:
+            List of the created events, in input order
+        """
+        coherences = np.asarray(coherences, dtype=np.float64)
+        entropies = np.asarray(entropies, dtype=np.float64)
+        count = len(contents)
+        if not (len(coherences) == len(entropies) == count):
+            raise ValueError("contents, coherences and entropies must have equal length")
+        if count == 0:
+            return []
+        
+        self._expire_due()
+        targets = None
+        if self._content_index is not None:
+            targets, digests, contents, coherences, entropies, duplicates = self._fold_duplicates(
+                contents, coherences, entropies)
+            count = len(contents)
+            if count == 0:
+                self._journal_commit()
+                return targets
+        
+        store = self._store
+        timestamp = time.time()
+        morals = coherences - entropies
+        phase_increment = (2 * math.pi) / self.update_frequency
+        steps = np.arange(count + 1, dtype=np.float64)
+        phases = (self.current_phase + steps * phase_increment) % (2 * math.pi)
+        phases, next_phases = phases[:-1], phases[1:]
+        
+        # Replay capacity management to learn which events sequential insertion
+        # would evict, and the ten-event window each insert would see. Batch
+        # events are identified by index, stored rows by -1 - row.
+        overflow = len(store) + count - self.max_capacity
+        lowest_rows = []
+        if overflow > 0:
+            rows = store.rows()
+            store.settle_rows(rows)
+            limit = min(overflow, len(rows))
+            if limit:
+                kth_moral = np.partition(store.moral_value[rows], limit - 1)[limit - 1]
+                candidates = rows[store.moral_value[rows] <= kth_moral]
+                order = np.lexsort((store.seq[candidates], store.moral_value[candidates]))
+                lowest_rows = candidates[order[:limit]].tolist()
+        lowest_morals = store.moral_value[lowest_rows].tolist()
+        batch_morals = morals.tolist()
+        
+        window = [-1 - row for row in store.recent_rows(10)]
+        cursor = store.prev[-1 - window[0]] if window else -1
+        backlog, evicted = [], set()
+        pending, next_lowest = [], 0
+        size = len(store)
+        window_before = np.full((count, 10), count, dtype=np.int64)
+        window_after = np.full((count, 10), count, dtype=np.int64)
+        
+        for i in range(count):
+            window_before[i, 10 - len(window):] = window
+            window.append(i)
+            if len(window) > 10:
+                backlog.append(window.pop(0))
+            heapq.heappush(pending, (batch_morals[i], i))
+            size += 1
+            
+            if size > self.max_capacity:
+                size -= 1
+                if next_lowest < len(lowest_rows) and lowest_morals[next_lowest] <= pending[0][0]:
+                    victim = -1 - lowest_rows[next_lowest]
+                    next_lowest += 1
+                else:
+                    victim = heapq.heappop(pending)[1]
+                evicted.add(victim)
+                
+                if victim in window:
+                    window.remove(victim)
+                    while backlog and backlog[-1] in evicted:
+                        backlog.pop()
+                    if backlog:
+                        window.insert(0, backlog.pop())
+                    else:
+                        while cursor >= 0 and -1 - int(cursor) in evicted:
+                            cursor = store.prev[cursor]
+                        if cursor >= 0:
+                            window.insert(0, -1 - int(cursor))
+                            cursor = store.prev[cursor]
+            
+            window_after[i, 10 - len(window):] = window
+        
+        # Window ids index a combined column: batch values, a pad slot (id
+        # == count), then stored rows (id -1 - row lands on count + 1 + row)
+        def gather(batch_values, stored_values, ids):
+            combined = np.concatenate([batch_values, [0.0], stored_values])
+            return combined[np.where(ids < 0, count - ids, ids)]
+        
+        def window_means(values, ids):
+            valid = ids != count
+            counts = valid.sum(axis=1)
+            sums = np.where(valid, values, 0.0).sum(axis=1)
+            return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+        
+        resonances = self._harmonic_weights(gather(phases, store.phase, window_before), phases[:, None])
+        harmonic_resonance = window_means(resonances, window_before)
+        
+        # Only the most recent entries survive in the bounded history deques
+        ids_after = window_after[-min(count, self.coherence_history.maxlen):]
+        coherence_means = window_means(gather(coherences, store.coherence_score, ids_after), ids_after)
+        entropy_means = window_means(gather(entropies, store.entropy_score, ids_after), ids_after)
+        
+        for victim in evicted:
+            if victim < 0:
+                store.release(-1 - victim)
+        
+        events = []
+        for i in range(count):
+            if i in evicted:
+                event = MemoryEvent(
+                    content=contents[i],
+                    timestamp=timestamp,
+                    phase=phases[i],
+                    coherence_score=coherences[i],
+                    entropy_score=entropies[i],
+                    harmonic_resonance=harmonic_resonance[i],
+                    duplicate_count=duplicates[i] if targets is not None else 0
+                )
+            else:
+                row = store.allocate(contents[i], timestamp, phases[i], coherences[i], entropies[i])
+                store.harmonic_resonance[row] = harmonic_resonance[i]
+                if targets is not None:
+                    self._content_index.assign(row, digests[i])
+                    if duplicates[i]:
+                        store.duplicate_count[row] = duplicates[i]
+                        if self._journal is not None:
+                            self._journal.log_merge(row)
+                event = store.view(row)
+            events.append(event)
+        
+        # Advance phase, reinforcing once for every cycle completed in the batch
+        self.current_phase = float(next_phases[-1])
+        for cycle_phase in next_phases[next_phases < phase_increment].tolist():
+            self.cycle_count += 1
+            self._reinforce_coherent_memories(cycle_phase)
+        
+        self.coherence_history.extend(coherence_means.tolist())
+        self._history_count += len(coherence_means)
+        self.entropy_history.extend(entropy_means.tolist())
+        if len(self.coherence_history) >= 2:
+            coherence_trend = self.coherence_history[-1] - self.coherence_history[-2]
+            entropy_trend = self.entropy_history[-1] - self.entropy_history[-2]
+            self.moral_momentum = coherence_trend - entropy_trend
+        
+        # Check for automatic coherence intervention once per touched region
+        region_phases = {}
+        for phase in next_phases.tolist():
+            region = int(phase // self.monitor.DETECTION_RADIUS)
+            region_phases.pop(region, None)
+            region_phases[region] = phase
+        for phase in region_phases.values():
+            self._check_coherence(phase)
+        
+        self._journal_commit()
+        if targets is not None:
+            return [events[target] if isinstance(target, int) else target for target in targets]
+        return events
+    
     def recall_by_coherence(self, 
                            target_coherence: float, 
-                           top_k: int = 5) -> List[MemoryEvent]:
+                           top_k: int = 5,
+                           epsilon: float = 0.0) -> List[MemoryEvent]:
         """
         Retrieve memories using coherence-based harmonic recall
         
         Args:
             target_coherence: Desired coherence level (0-1)
             top_k: Number of memories to retrieve
+            epsilon: Recall score tolerance for approximate recall: regions
+                that could only improve the result by less than epsilon are
+                skipped, so every returned memory scores at least the exact
+                k-th best minus epsilon; 0 is exact. Regions are recall index
+                cells, or without the index phase sectors, whose looser
+                bounds skip less for the same epsilon.
             
         Returns:
             List of memories ranked by relevance and moral value
         """
-        if not self.events:
-            return []
+        store = self._store
+        self.expire()
+        recalled_rows = self._recall_rows(target_coherence, top_k, epsilon)
+        self._record_access(recalled_rows)
+        return [store.view(row) for row in recalled_rows.tolist()]
+    
+    def recall_similar(self, query: Any, top_k: int = 5, n_probe: int = None) -> List[MemoryEvent]:
+        """
+        Retrieve memories whose content is like the query
         
-        scored_events = []
+        Ranks events as recall_by_coherence does, with the cosine similarity
+        of content embeddings in place of coherence similarity. Requires
+        embedding_dim.
         
-        for event in self.events:
-            # Calculate multi-factor recall score
-            harmonic_weight = self._harmonic_weight(event.phase, self.current_phase)
-            coherence_similarity = 1.0 - abs(event.coherence_score - target_coherence)
-            
-            recall_score = (
-                event.moral_value * 0.4 +      # Prioritize beneficial patterns
-                harmonic_weight * 0.3 +        # Phase resonance
-                coherence_similarity * 0.3     # Target alignment
-            )
+        Args:
+            query: Embedding vector (NumPy array) or content to featurize
+            top_k: Number of memories to retrieve
+            n_probe: Inverted-file lists to scan (defaults to ivf_probe;
+                ignored until the inverted file is trained)
             
-            scored_events.append((recall_score, event))
-        
-        # Return top-k by score
-        scored_events.sort(key=lambda x: x[0], reverse=True)
-        recalled = [event for _, event in scored_events[:top_k]]
-        
-        # Update access patterns
-        for event in recalled:
-            event.access_count += 1
-            event.last_accessed = time.time()
-        
-        return recalled
+        Returns:
+            List of memories ranked by similarity, relevance and moral value
+        """
+        store = self._store
+        self.expire()
+        recalled_rows = self._similar_rows(query, top_k, n_probe)
+        self._record_access(recalled_rows)
+        return [store.view(row) for row in recalled_rows.tolist()]
     
     def get_phase_neighbors(self, phase: float, radius: float) -> List[MemoryEvent]:
         """Get events within specified phase radius"""
-        neighbors = []
-        for event in self.events:
-            if event.phase_distance(phase) <= radius:
-                neighbors.append(event)
-        return neighbors
-    
-    def auto_tune_frequency(self):
-        """Automatically adjust update frequency to optimize coherence"""
+        store = self._store
+        self.expire()
+        rows = self._phase_neighbor_rows(phase, radius)
+        return [store.view(row) for row in store.ordered(rows)]
+    
+    def auto_tune_frequency(self, test_frequencies: List[float] = None, steps: int = 10):
+        """
+        Automatically adjust update frequency to optimize coherence
+        
+        Args:
+            test_frequencies: Candidate frequencies in Hz (defaults to the
+                harmonic series in TUNING_FREQUENCIES)
+            steps: Number of phase steps simulated per candidate
+        """
         if len(self.coherence_history) < 10:
             return
         
@@ -231,58 +3074,730 @@ class SpiralBuffer:
         
         # Test harmonics of optimal frequency if coherence is low
         if recent_coherence < self.coherence_threshold:
-            test_frequencies = [216, 432, 864, 1296]  # Harmonic series
-            
-            best_freq = self.update_frequency
-            best_coherence = recent_coherence
+            if test_frequencies is None:
+                test_frequencies = self.TUNING_FREQUENCIES
             
-            for freq in test_frequencies:
-                test_coherence = self._simulate_coherence_at_frequency(freq)
-                if test_coherence > best_coherence:
-                    best_coherence = test_coherence
-                    best_freq = freq
+            test_coherence = self.sweep_frequencies(test_frequencies, steps)
+            best = int(np.argmax(test_coherence))  # First of any ties, as a sequential scan
             
-            if best_freq != self.update_frequency:
-                self.update_frequency = best_freq
-                return True
+            if test_coherence[best] > recent_coherence:
+                best_freq = test_frequencies[best]
+                if best_freq != self.update_frequency:
+                    self.update_frequency = best_freq
+                    self._journal_commit()
+                    return True
         
         return False
     
+    def sweep_frequencies(self, frequencies, steps=10) -> np.ndarray:
+        """
+        Simulate system coherence for many candidate update frequencies at once
+        
+        Each candidate advances the phase from the current position for its
+        number of steps; the result is the mean harmonic resonance between
+        every simulated phase and every event with moral value above 0.5.
+        All candidates are evaluated in one broadcasted computation, chunked
+        over events to bound memory.
+        
+        Args:
+            frequencies: Array of candidate frequencies in Hz
+            steps: Number of phase steps per candidate (scalar or one per frequency)
+            
+        Returns:
+            Simulated coherence for each frequency (0.5 when no event qualifies)
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64).reshape(-1)
+        steps = np.broadcast_to(np.asarray(steps, dtype=np.int64), frequencies.shape)
+        
+        store = self._store
+        rows = store.rows()
+        store.settle_rows(rows)
+        high_value_phases = store.phase[rows[store.moral_value[rows] > 0.5]]
+        if not len(high_value_phases) or not len(frequencies):
+            return np.full(frequencies.shape, 0.5)
+        
+        # Simulated phases for every (frequency, step) pair, padded to the longest run
+        max_steps = int(steps.max())
+        step_numbers = np.arange(1, max_steps + 1)
+        test_phases = (self.current_phase + np.outer((2 * math.pi) / frequencies, step_numbers)) % (2 * math.pi)
+        active = step_numbers[None, :] <= steps[:, None]
+        
+        resonance = np.zeros(test_phases.shape)
+        chunk = max(1, self.SWEEP_CHUNK_SIZE // test_phases.size)
+        for start in range(0, len(high_value_phases), chunk):
+            phases = high_value_phases[start:start + chunk]
+            resonance += self._harmonic_weights(phases[None, None, :], test_phases[:, :, None]).sum(axis=2)
+        
+        total_resonance = np.where(active, resonance, 0.0).sum(axis=1)
+        return total_resonance / (np.maximum(steps, 1) * len(high_value_phases))
+    
     def get_system_metrics(self) -> Dict:
         """Get comprehensive system performance metrics"""
-        if not self.events:
+        store = self._store
+        if not len(store):
             return {'status': 'empty'}
         
+        self._settle_all()
+        avg_moral_value, avg_coherence, avg_entropy = self._aggregates.means()
+        
         return {
-            'total_events': len(self.events),
+            'total_events': len(store),
             'current_phase': self.current_phase,
             'update_frequency': self.update_frequency,
             'cycle_count': self.cycle_count,
-            'avg_moral_value': np.mean([e.moral_value for e in self.events]),
-            'avg_coherence': np.mean([e.coherence_score for e in self.events]),
-            'avg_entropy': np.mean([e.entropy_score for e in self.events]),
+            'avg_moral_value': avg_moral_value,
+            'avg_coherence': avg_coherence,
+            'avg_entropy': avg_entropy,
             'moral_momentum': self.moral_momentum,
             'coherence_interventions': len(self.monitor.interventions),
-            'high_value_events': len([e for e in self.events if e.moral_value > 0.7]),
+            'high_value_events': self._aggregates.high_value_count,
             'stability_score': self._calculate_stability_score()
         }
     
+    def get_performance_metrics(self) -> Dict:
+        """
+        Get call counts and latency distributions of the instrumented hot paths
+        
+        Returns:
+            {'status': 'disabled'} unless instrumented; otherwise a dict
+            mapping each stage called so far (method name without leading
+            underscores) to its count, total_ms, and mean, min, p50, p90,
+            p99, p999 and max latency in microseconds
+        """
+        if self._instrumentation is None:
+            return {'status': 'disabled'}
+        return self._instrumentation.summary()
+    
+    def set_instrumented(self, enabled: bool):
+        """
+        Turn hot-path instrumentation on or off
+        
+        Enabling starts from empty histograms; disabling restores the plain
+        methods and discards what was recorded.
+        
+        Args:
+            enabled: Whether to time the methods in INSTRUMENTED_METHODS
+        """
+        if self._instrumentation is not None:
+            self._instrumentation.detach()
+            self._instrumentation = None
+        if enabled:
+            self._instrumentation = self._make_instrumentation()
+            self._instrumentation.attach(self, self.INSTRUMENTED_METHODS)
+            self._instrumentation.attach(self.monitor, self.MONITOR_INSTRUMENTED_METHODS)
+        self.instrumented = enabled
+    
+    def _make_instrumentation(self) -> Instrumentation:
+        """Instrumentation suited to how this buffer is called"""
+        return Instrumentation()
+    
+    def expire(self, now: float = None) -> int:
+        """
+        Remove events whose time-to-live has run out
+        
+        Runs automatically at the start of insertion, recall and neighbor
+        queries; call it to expire events while the buffer is otherwise idle.
+        
+        Args:
+            now: Current time in seconds (defaults to time.time())
+            
+        Returns:
+            Number of events expired
+        """
+        expired = self._expire_due(now)
+        if expired:
+            self._journal_commit()
+        return expired
+    
+    def save(self, path: str):
+        """
+        Write a snapshot of the buffer to a directory
+        
+        Numeric columns are stored as fixed-width .npy files that load()
+        can memory-map, content as pickles in one offset-indexed blob, and
+        phase, cycle, history, aggregate and monitor state as JSON. The
+        snapshot is written beside `path` and swapped in when complete.
+        
+        Every file and the directory swap are fsynced before the journal
+        is emptied.
+        
+        Args:
+            path: Snapshot directory (replaced if it exists)
+        """
+        store = self._store
+        if self._journal is not None:
+            self._journal_commit()
+            self._journal.flush(sync=True)
+        staging = path.rstrip(os.sep) + '.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        
+        for name in EventStore.ARRAYS:
+            np.save(os.path.join(staging, name + '.npy'), getattr(store, name))
+        
+        offsets = np.zeros(store.capacity + 1, dtype=np.int64)
+        with open(os.path.join(staging, 'content.bin'), 'wb') as blob:
+            position = 0
+            for row in range(store.capacity):
+                if row < store.high_water and store.live[row]:
+                    raw = store.content_bytes(row)
+                    blob.write(raw)
+                    position += len(raw)
+                offsets[row + 1] = position
+        np.save(os.path.join(staging, 'content_offsets.npy'), offsets)
+        if self._embedding_index is not None:
+            np.save(os.path.join(staging, 'embedding.npy'), self._embedding_index.embeddings())
+        
+        meta = {
+            'version': self.SNAPSHOT_VERSION,
+            'config': {
+                'max_capacity': self.max_capacity,
+                'update_frequency': float(self.update_frequency),
+                'coherence_threshold': self.coherence_threshold,
+                'harmonic_table_size': self.harmonic_table.size if self.harmonic_table else None,
+                'lazy_reinforcement': self.lazy_reinforcement,
+                'metrics_recompute_interval': self.metrics_recompute_interval,
+                'compact_content': self.compact_content,
+                'deduplicate': self.deduplicate,
+                'merge_policy': self.merge_policy,
+                'ttl': self.ttl,
+                'expire_by': self.expire_by,
+                'expiry_tick': self.expiry_tick,
+                'decay_interval': self.decay_interval,
+                'recall_index': self.recall_index,
+                'embedding_dim': self.embedding_dim,
+                'ivf_lists': self.ivf_lists,
+                'ivf_probe': self.ivf_probe,
+                'recall_cache_size': self.recall_cache_size,
+                'recall_cache_resolution': self.recall_cache_resolution,
+                'instrumented': self.instrumented,
+            },
+            'state': {
+                'current_phase': self.current_phase,
+                'cycle_count': self.cycle_count,
+                'coherence_history': list(self.coherence_history),
+                'entropy_history': list(self.entropy_history),
+                'moral_momentum': self.moral_momentum,
+                'phase_momentum': self.phase_momentum,
+                'resonance_decay': self.resonance_decay,
+                'reinforcement_phases': self._reinforcement_phases,
+                'phase_base': self._phase_base,
+                'journal_lsn': self._journal.lsn if self._journal is not None else self._journal_lsn,
+            },
+            'store': store.get_state(),
+            'aggregates': self._aggregates.get_state(),
+            'monitor': {
+                'intervention_threshold': self.monitor.intervention_threshold,
+                'interventions': self.monitor.interventions.get_state(),
+            },
+        }
+        with open(os.path.join(staging, 'snapshot.json'), 'w') as f:
+            json.dump(meta, f)
+        
+        # Make the staged snapshot durable before it replaces anything
+        for name in os.listdir(staging):
+            self._fsync_path(os.path.join(staging, name))
+        self._fsync_path(staging)
+        
+        # Swap the finished snapshot into place; until the second rename
+        # completes, load() falls back to the retired copy
+        retired = path.rstrip(os.sep) + '.old'
+        parent = os.path.dirname(os.path.abspath(path))
+        shutil.rmtree(retired, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, retired)
+        os.rename(staging, path)
+        self._fsync_path(parent)
+        shutil.rmtree(retired, ignore_errors=True)
+        
+        # The snapshot now covers everything journaled so far
+        if self._journal is not None:
+            self._journal.reset()
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, featurizer: Callable[[Any], np.ndarray] = None) -> 'SpiralBuffer':
+        """
+        Restore a buffer from a snapshot written by save()
+        
+        Args:
+            path: Snapshot directory (falls back to the previous snapshot
+                at path + '.old' when save() was interrupted mid-swap)
+            mmap: Memory-map the numeric columns copy-on-write instead of
+                reading them into memory; content is unpickled lazily either way
+            featurizer: The featurizer of a buffer saved with a custom one
+                (featurizers are not saved)
+            
+        Returns:
+            SpiralBuffer in the saved state
+        """
+        path = cls._snapshot_dir(path) or path
+        with open(os.path.join(path, 'snapshot.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {meta.get('version')}")
+        
+        mmap_mode = 'c' if mmap else None
+        arrays = {}
+        for name in EventStore.ARRAYS:
+            column = os.path.join(path, name + '.npy')
+            if os.path.exists(column):
+                arrays[name] = np.load(column, mmap_mode=mmap_mode)
+            else:
+                # Column added since the snapshot was written
+                arrays[name] = np.zeros(meta['store']['capacity'], dtype=EventStore.FIELDS[name])
+        offsets = np.load(os.path.join(path, 'content_offsets.npy'), mmap_mode=mmap_mode)
+        
+        with open(os.path.join(path, 'content.bin'), 'rb') as f:
+            if mmap and os.fstat(f.fileno()).st_size:
+                blob = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ)
+            else:
+                blob = f.read()
+        
+        store_state = meta['store']
+        store = EventStore(store_state['capacity'], arrays, SnapshotContent(blob, offsets))
+        store.set_state(store_state)
+        
+        buffer = cls(featurizer=featurizer, **meta['config'])
+        buffer._attach_store(store)
+        buffer._aggregates.set_state(meta['aggregates'])
+        embedding = os.path.join(path, 'embedding.npy')
+        if buffer._embedding_index is not None and os.path.exists(embedding):
+            buffer._embedding_index.set_embeddings(np.load(embedding, mmap_mode=mmap_mode))
+        
+        state = meta['state']
+        buffer.current_phase = state['current_phase']
+        buffer.cycle_count = state['cycle_count']
+        buffer.coherence_history.extend(state['coherence_history'])
+        buffer.entropy_history.extend(state['entropy_history'])
+        buffer.moral_momentum = state['moral_momentum']
+        buffer.phase_momentum = state['phase_momentum']
+        buffer.resonance_decay = state['resonance_decay']
+        buffer._reinforcement_phases = list(state['reinforcement_phases'])
+        buffer._phase_base = state.get('phase_base', 0)
+        buffer._journal_lsn = state['journal_lsn']
+        
+        buffer.monitor.intervention_threshold = meta['monitor']['intervention_threshold']
+        buffer.monitor.interventions.set_state(meta['monitor']['interventions'])
+        return buffer
+    
+    @classmethod
+    def recover(cls, 
+                journal_path: str, 
+                snapshot_path: str = None, 
+                mmap: bool = True,
+                group_commit: int = 1,
+                fsync: str = 'interval',
+                fsync_interval: float = 1.0,
+                **config) -> 'SpiralBuffer':
+        """
+        Rebuild a buffer from its last snapshot and journal, then keep journaling
+        
+        Loads the snapshot if one exists (otherwise starts from an empty
+        buffer built with `config`), replays the journal's committed
+        transactions newer than the snapshot, and reattaches the journal.
+        
+        Args:
+            journal_path: Journal file (created if missing)
+            snapshot_path: Snapshot directory written by save(), if any
+            mmap: Memory-map snapshot columns (see load)
+            group_commit: Transactions per journal write (see Journal)
+            fsync: Journal durability policy (see Journal)
+            fsync_interval: Seconds between fsyncs under the 'interval' policy
+            **config: SpiralBuffer arguments used when there is no snapshot
+            
+        Returns:
+            SpiralBuffer in its last committed state
+        """
+        if snapshot_path is not None and cls._snapshot_dir(snapshot_path) is not None:
+            buffer = cls.load(snapshot_path, mmap, config.get('featurizer'))
+        else:
+            buffer = cls(**config)
+        
+        transactions, _ = Journal.read(journal_path)
+        for state, records in transactions:
+            if state['lsn'] > buffer._journal_lsn:
+                buffer._replay_transaction(state, records)
+        
+        buffer.attach_journal(journal_path, group_commit, fsync, fsync_interval)
+        return buffer
+    
+    def attach_journal(self, 
+                       path: str, 
+                       group_commit: int = 1, 
+                       fsync: str = 'interval',
+                       fsync_interval: float = 1.0) -> Journal:
+        """
+        Record every subsequent mutation in a write-ahead journal
+        
+        Journaled changes are those made through the buffer's methods and
+        MemoryEvent score setters; a change made outside a buffer operation
+        is committed with the next operation or flush_journal(). save()
+        empties the journal once the snapshot covers it.
+        
+        Args:
+            path: Journal file (created if missing)
+            group_commit: Transactions per journal write (see Journal)
+            fsync: Durability policy: 'always', 'interval' or 'never'
+            fsync_interval: Seconds between fsyncs under the 'interval' policy
+            
+        Returns:
+            The attached Journal
+        """
+        if self._journal is not None:
+            raise ValueError("A journal is already attached")
+        journal = Journal(path, group_commit, fsync, fsync_interval)
+        try:
+            journal.bind(self)
+        except ValueError:
+            journal.close()
+            raise
+        self._journal = journal
+        return journal
+    
+    def flush_journal(self):
+        """Commit any open journal records and fsync the journal"""
+        if self._journal is not None:
+            self._journal_commit()
+            self._journal.flush(sync=True)
+    
+    def detach_journal(self):
+        """Flush and close the attached journal"""
+        if self._journal is not None:
+            self._journal_commit()
+            self._journal_lsn = self._journal.lsn
+            self._journal.close()
+            self._journal = None
+    
     # Private helper methods
     
+    @staticmethod
+    def _fsync_path(path: str):
+        """fsync a file or directory"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def _snapshot_dir(path: str) -> Optional[str]:
+        """The complete snapshot at `path`, or the copy save() retired if it was interrupted mid-swap"""
+        for candidate in (path, path.rstrip(os.sep) + '.old'):
+            if os.path.exists(os.path.join(candidate, 'snapshot.json')):
+                return candidate
+        return None
+    
+    def _journal_commit(self):
+        """End the current journal transaction, if journaling"""
+        if self._journal is not None:
+            self._journal.commit(self)
+    
+    def _replay_transaction(self, state: Dict, records: List[Tuple]):
+        """Redo one committed journal transaction"""
+        if state['lsn'] != self._journal_lsn + 1:
+            raise ValueError(f"Journal does not continue from LSN {self._journal_lsn}")
+        store = self._store
+        
+        for record in records:
+            kind = record[0]
+            if kind == Journal.ADD:
+                (row, timestamp, phase, coherence, entropy, 
+                 moral, resonance, seq, applied_epoch, content) = record[1:]
+                if store.allocate(pickle.loads(content), timestamp, phase, coherence, entropy) != row:
+                    raise ValueError("Journal does not match the buffer's row layout")
+                store.harmonic_resonance[row] = resonance
+                store.applied_epoch[row] = applied_epoch
+            elif kind == Journal.EVICT:
+                store.release(record[1])
+            elif kind == Journal.RESCORE:
+                store.write_scores(*record[1:])
+            elif kind == Journal.ACCESS:
+                rows, timestamp = record[1:]
+                store.access_count[rows] += 1
+                store.last_accessed[rows] = timestamp
+            elif kind == Journal.SETTLE:
+                rows, applied_epoch = record[1:]
+                store.applied_epoch[rows] = applied_epoch
+            elif kind == Journal.MERGE:
+                row, timestamp, duplicate_count = record[1:]
+                store.timestamp[row] = timestamp
+                store.duplicate_count[row] = duplicate_count
+        
+        self.current_phase = state['current_phase']
+        self.update_frequency = state['update_frequency']
+        self.cycle_count = state['cycle_count']
+        self.moral_momentum = state['moral_momentum']
+        store.epoch = state['epoch']
+        store.settled_epoch = state['settled_epoch']
+        self.coherence_history.extend(state['coherence_history'])
+        self.entropy_history.extend(state['entropy_history'])
+        self._history_count += len(state['coherence_history'])
+        first_epoch = state['epoch'] - len(state['reinforcement_phases'])
+        if first_epoch != self._phase_base + len(self._reinforcement_phases):
+            # The epochs in between were trimmed after every row settled past them
+            self._reinforcement_phases = []
+            self._phase_base = first_epoch
+        self._reinforcement_phases.extend(state['reinforcement_phases'])
+        self.monitor.interventions.extend(state['interventions'])
+        self._journal_lsn = state['lsn']
+    
+    def _store_event(self, content: Any, coherence: float, entropy: float) -> int:
+        """Allocate a row for a new event at the current phase and set its resonance"""
+        store = self._store
+        
+        # Calculate harmonic resonance with recent events
+        recent_rows = store.recent_rows(10)
+        row = store.allocate(content, time.time(), self.current_phase, coherence, entropy)
+        
+        if recent_rows:
+            resonances = self._harmonic_weights(store.phase[recent_rows], self.current_phase)
+            store.harmonic_resonance[row] = np.mean(resonances)
+        return row
+    
+    def _expire_due(self, now: float = None) -> int:
+        """Release the rows the expiry wheel reports as past their deadline"""
+        if self._expiry is None:
+            return 0
+        expired = self._expiry.advance(time.time() if now is None else now)
+        for row in expired:
+            self._store.release(row)
+        return len(expired)
+    
+    def _decay_factors(self, rows) -> Any:
+        """Resonance decay accumulated since each row's `expire_by` time"""
+        store = self._store
+        reference = store.timestamp[rows]
+        if self.expire_by == 'last_accessed':
+            reference = np.maximum(reference, store.last_accessed[rows])
+        age = np.maximum(time.time() - reference, 0.0)
+        return self.resonance_decay ** (age / self.decay_interval)
+    
+    def _merge_duplicate(self, row: int, coherence: float, entropy: float, timestamp: float):
+        """Fold a duplicate arrival into a stored row according to the merge policy"""
+        store = self._store
+        arrivals = int(store.duplicate_count[row]) + 1
+        if self.merge_policy in ('replace', 'mean'):
+            store.settle_rows((row,))
+            merged = self._merged_scores(float(store.coherence_score[row]), float(store.entropy_score[row]),
+                                         arrivals, coherence, entropy)
+            store.write_morality(row, *merged)
+        store.duplicate_count[row] = arrivals
+        if self.merge_policy != 'count':
+            store.timestamp[row] = timestamp
+        if self._journal is not None:
+            self._journal.log_merge(row)
+    
+    def _merged_scores(self, 
+                       coherence: float, 
+                       entropy: float, 
+                       arrivals: int,
+                       new_coherence: float, 
+                       new_entropy: float) -> Tuple[float, float]:
+        """Scores of an event after a duplicate arrival, given the arrivals already folded in"""
+        if self.merge_policy == 'replace':
+            return new_coherence, new_entropy
+        if self.merge_policy == 'mean':
+            return ((coherence * arrivals + new_coherence) / (arrivals + 1),
+                    (entropy * arrivals + new_entropy) / (arrivals + 1))
+        return coherence, entropy
+    
+    def _fold_duplicates(self, 
+                         contents: List[Any], 
+                         coherences: np.ndarray, 
+                         entropies: np.ndarray) -> Tuple:
+        """
+        Merge a batch's duplicates ahead of inserting it
+        
+        Items whose content is stored are merged into the stored event;
+        later copies of content first seen in the batch are merged into the
+        first copy.
+        
+        Returns:
+            (targets, digests, contents, coherences, entropies, duplicates):
+            for each item, the stored event it merged into or the index of its
+            first copy among the unique items, then each unique item's digest,
+            content, merged scores and number of copies folded into it
+        """
+        store, index = self._store, self._content_index
+        timestamp = time.time()
+        targets, firsts = [], {}
+        digests, unique_contents, unique_coherences, unique_entropies, duplicates = [], [], [], [], []
+        
+        for content, coherence, entropy in zip(contents, coherences.tolist(), entropies.tolist()):
+            digest = index.digest(content)
+            first = firsts.get(digest)
+            if first is not None:
+                unique_coherences[first], unique_entropies[first] = self._merged_scores(
+                    unique_coherences[first], unique_entropies[first], duplicates[first] + 1, 
+                    coherence, entropy)
+                duplicates[first] += 1
+                targets.append(first)
+                continue
+            
+            row = index.find(digest)
+            if row is not None:
+                self._merge_duplicate(row, coherence, entropy, timestamp)
+                targets.append(store.view(row))
+                continue
+            
+            firsts[digest] = len(digests)
+            targets.append(len(digests))
+            digests.append(digest)
+            unique_contents.append(content)
+            unique_coherences.append(coherence)
+            unique_entropies.append(entropy)
+            duplicates.append(0)
+        
+        return (targets, digests, unique_contents, np.array(unique_coherences, dtype=np.float64),
+                np.array(unique_entropies, dtype=np.float64), duplicates)
+    
+    def _check_coherence(self, phase: float):
+        """Run the coherence monitor at a phase, stabilizing the region if threatened"""
+        if self.monitor.detect_entropy_threat(self, phase):
+            self.monitor.stabilize_region(self, phase)
+    
+    def _recall_rows(self, target_coherence: float, top_k: int, epsilon: float = 0.0) -> np.ndarray:
+        """Rows recall_by_coherence returns, best first, from the recall cache when current"""
+        target_coherence = self._recall_target(target_coherence)
+        cache = self._recall_cache
+        if cache is None:
+            return self._rank_rows(target_coherence, top_k, epsilon)
+        
+        # The phase only moves with a mutation, but may also be assigned directly
+        key = (float(target_coherence), int(top_k), float(epsilon), self.current_phase)
+        rows = cache.get(key)
+        if rows is None:
+            rows = self._rank_rows(target_coherence, top_k, epsilon)
+            cache.put(key, rows)
+        return rows
+    
+    def _recall_target(self, target_coherence: float) -> float:
+        """Target coherence recall ranks by, rounded to recall_cache_resolution if set"""
+        if self.recall_cache_resolution:
+            return round(target_coherence / self.recall_cache_resolution) * self.recall_cache_resolution
+        return target_coherence
+    
+    def _rank_rows(self, target_coherence: float, top_k: int, epsilon: float = 0.0) -> np.ndarray:
+        """Rows recall_by_coherence returns, best first"""
+        store = self._store
+        if self._recall_index is not None or epsilon > 0:
+            if store.epoch != store.settled_epoch:
+                store.settle_rows(store.rows())
+            if self._recall_index is None:
+                return self._phase_index.top(self, target_coherence, top_k, epsilon)
+            return self._recall_index.top(self, target_coherence, top_k, epsilon)
+        
+        rows = store.rows()
+        if not len(rows):
+            return rows
+        store.settle_rows(rows)
+        scores = self._recall_scores(rows, target_coherence)
+        
+        # Return top-k by score
+        return self._select_top(rows, scores, top_k)
+    
+    def _similar_rows(self, query: Any, top_k: int, n_probe: int = None) -> np.ndarray:
+        """Rows recall_similar returns, best first"""
+        index = self._embedding_index
+        if index is None:
+            raise ValueError("recall_similar requires embedding_dim")
+        vector = index.query_vector(query)
+        rows = index.candidates(vector, n_probe)
+        if not len(rows):
+            return rows
+        self._store.settle_rows(rows)
+        scores = self._blended_scores(rows, index.similarities(rows, vector))
+        return self._select_top(rows, scores, top_k)
+    
+    def _record_access(self, rows: np.ndarray):
+        """Update access patterns of recalled rows"""
+        if not len(rows):
+            return
+        store = self._store
+        accessed_at = time.time()
+        store.access_count[rows] += 1
+        store.last_accessed[rows] = accessed_at
+        if self._journal is not None:
+            self._journal.log_access(rows, accessed_at)
+            self._journal_commit()
+    
+    def _evict_lowest(self):
+        """Remove the stored event with the lowest moral value (earliest first on ties)"""
+        store = self._store
+        row = self._eviction_heap.peek()
+        
+        # Pending boosts only raise moral value, so heap keys are lower bounds:
+        # settle the root until it is current
+        while store.applied_epoch[row] != store.epoch:
+            store.settle_rows((row,))
+            row = self._eviction_heap.peek()
+        store.release(row)
+    
+    def _phase_neighbor_rows(self, phase: float, radius: float) -> np.ndarray:
+        """Rows of events within the given phase radius (unordered)"""
+        return self._phase_index.query(phase, radius)
+    
+    def _phase_window_totals(self, phase: float, radius: float) -> Tuple[int, float]:
+        """(count, moral value sum) of events within the given phase radius"""
+        return self._phase_index.window_totals(phase, radius)
+    
+    def _recall_scores(self, rows: np.ndarray, target_coherence: float) -> np.ndarray:
+        """Multi-factor recall score for each row"""
+        coherence_similarity = 1.0 - np.abs(self._store.coherence_score[rows] - target_coherence)
+        return self._blended_scores(rows, coherence_similarity)
+    
+    def _blended_scores(self, rows: np.ndarray, similarity: np.ndarray) -> np.ndarray:
+        """Recall score for each row given its similarity to the query"""
+        store = self._store
+        harmonic_weight = self._harmonic_weights(store.phase[rows], self.current_phase)
+        
+        return (
+            store.moral_value[rows] * 0.4 +    # Prioritize beneficial patterns
+            harmonic_weight * 0.3 +            # Phase resonance
+            similarity * 0.3                   # Target alignment
+        )
+    
+    def _select_top(self, rows: np.ndarray, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Rows of the top_k scores, best first, earliest insertion first on ties"""
+        top_k = max(0, min(top_k, len(rows)))
+        if top_k == 0:
+            return rows[:0]
+        
+        # Partial selection, widened to keep every row tied with the k-th score
+        if top_k < len(rows):
+            kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+            keep = scores >= kth_score
+            rows, scores = rows[keep], scores[keep]
+        
+        order = np.lexsort((self._store.seq[rows], -scores))[:top_k]
+        return rows[order]
+    
+    def _harmonic_weights(self, phases: np.ndarray, phase: float) -> np.ndarray:
+        """Vectorized _harmonic_weight, broadcasting phases against phase"""
+        return harmonic_weight(phases, phase, self.harmonic_table)
+    
+    def _harmonic_bin_bounds(self, n_bins: int) -> np.ndarray:
+        """Largest harmonic weight to the current phase over each of n_bins equal phase bins"""
+        # Harmonic offset is a tent over each π/2 period of the phase difference,
+        # so its minimum over a bin sits at a bin edge or is 0 at a peak inside
+        width = 2 * math.pi / n_bins
+        lead = np.mod(np.arange(n_bins) * width - self.current_phase, HARMONIC_SPACING)
+        nearest = np.minimum(lead, HARMONIC_SPACING - (lead + width))
+        nearest = np.where(lead + width >= HARMONIC_SPACING, 0.0, np.maximum(nearest, 0.0))
+        return self._harmonic_weights(nearest, 0.0)
+    
     def _harmonic_weight(self, phase1: float, phase2: float) -> float:
         """Calculate harmonic resonance between two phases"""
+        if self.harmonic_table is not None:
+            return float(harmonic_weight(phase1, phase2, self.harmonic_table))
+        
         phase_diff = abs(phase1 - phase2)
         phase_diff = min(phase_diff, 2 * math.pi - phase_diff)
         
-        # Harmonic peaks at key intervals
-        harmonics = [0, math.pi/2, math.pi, 3*math.pi/2]
-        max_resonance = 0
-        
-        for harmonic in harmonics:
-            resonance = math.exp(-((phase_diff - harmonic) ** 2) / 0.2)
-            max_resonance = max(max_resonance, resonance)
-        
-        return max_resonance
+        # Harmonic peaks at multiples of π/2; only the nearest one matters
+        offset = phase_diff % HARMONIC_SPACING
+        offset = min(offset, HARMONIC_SPACING - offset)
+        return math.exp(-(offset ** 2) / HARMONIC_WIDTH)
     
     def _advance_phase(self):
         """Advance phase based on current update frequency"""
@@ -294,26 +3809,83 @@ class SpiralBuffer:
             self.cycle_count += 1
             self._reinforce_coherent_memories()
     
-    def _reinforce_coherent_memories(self):
+    def _reinforce_coherent_memories(self, phase: float = None):
         """Echo high-coherence memories forward in time"""
-        high_value_events = [e for e in self.events if e.moral_value > 0.7]
+        if phase is None:
+            phase = self.current_phase
+        store = self._store
+        
+        if self.lazy_reinforcement:
+            self._reinforcement_phases.append(phase)
+            store.epoch += 1
+            if len(self._reinforcement_phases) >= self.REINFORCEMENT_PHASE_LIMIT:
+                store.settle_rows(store.rows())
+            return
+        
+        rows = store.rows()
+        store.settle_rows(rows)
+        self._apply_reinforcement(rows, phase)
+    
+    def _apply_reinforcement(self, rows: np.ndarray, phase: float) -> np.ndarray:
+        """Boost high-value rows aligned with phase; returns rows left above 0.7"""
+        store = self._store
+        high_value_rows = rows[store.moral_value[rows] > 0.7]
+        
+        harmonic_alignment = self._harmonic_weights(store.phase[high_value_rows], phase)
+        aligned = harmonic_alignment > 0.5
+        if aligned.any():
+            # Strengthen coherent memories
+            boosted_rows = high_value_rows[aligned]
+            boost = 0.1 * harmonic_alignment[aligned]
+            new_coherence = np.minimum(1.0, store.coherence_score[boosted_rows] + boost)
+            store.write_morality_rows(boosted_rows, new_coherence, store.entropy_score[boosted_rows])
+        
+        return high_value_rows
+    
+    def _settle_all(self):
+        """Bring every row up to date with recorded reinforcement epochs"""
+        store = self._store
+        if store.epoch != store.settled_epoch:
+            store.settle_rows(store.rows())
+    
+    def _settle(self, rows: np.ndarray):
+        """Replay reinforcement epochs recorded since each row was last settled"""
+        store = self._store
+        full_sweep = len(rows) == len(store)
+        lagging = rows[store.applied_epoch[rows] != store.epoch]
+        
+        if len(lagging):
+            settled_rows = lagging
+            for epoch in range(int(store.applied_epoch[lagging].min()), store.epoch):
+                due = store.applied_epoch[lagging] == epoch
+                # Rows at or below 0.7 are never boosted again, so they can skip ahead
+                still_high = self._apply_reinforcement(lagging[due],
+                                                       self._reinforcement_phases[epoch - self._phase_base])
+                store.applied_epoch[lagging[due]] = store.epoch
+                store.applied_epoch[still_high] = epoch + 1
+                lagging = lagging[store.applied_epoch[lagging] != store.epoch]
+                if not len(lagging):
+                    break
+            if self._journal is not None:
+                self._journal.log_settle(settled_rows)
         
-        for event in high_value_events:
-            harmonic_alignment = self._harmonic_weight(event.phase, self.current_phase)
-            if harmonic_alignment > 0.5:
-                # Strengthen coherent memories
-                boost = 0.1 * harmonic_alignment
-                new_coherence = min(1.0, event.coherence_score + boost)
-                event.update_morality(new_coherence, event.entropy_score)
+        if full_sweep:
+            store.settled_epoch = store.epoch
+            # Every row is current, so no recorded epoch is replayed again
+            self._reinforcement_phases = []
+            self._phase_base = store.epoch
     
     def _update_metrics(self, new_event: MemoryEvent):
         """Update system-wide performance tracking"""
-        recent_events = self.events[-min(10, len(self.events)):]
+        store = self._store
+        recent_rows = store.recent_rows(10)
+        store.settle_rows(recent_rows)
         
-        avg_coherence = np.mean([e.coherence_score for e in recent_events])
-        avg_entropy = np.mean([e.entropy_score for e in recent_events])
+        avg_coherence = np.mean(store.coherence_score[recent_rows])
+        avg_entropy = np.mean(store.entropy_score[recent_rows])
         
         self.coherence_history.append(avg_coherence)
+        self._history_count += 1
         self.entropy_history.append(avg_entropy)
         
         # Calculate moral momentum
@@ -324,20 +3896,7 @@ class SpiralBuffer:
     
     def _simulate_coherence_at_frequency(self, test_frequency: float) -> float:
         """Simulate system coherence at different update frequency"""
-        high_value_events = [e for e in self.events if e.moral_value > 0.5]
-        if not high_value_events:
-            return 0.5
-        
-        test_phase_increment = (2 * math.pi) / test_frequency
-        test_phase = self.current_phase
-        
-        total_resonance = 0
-        for _ in range(10):  # Simulate 10 steps
-            test_phase = (test_phase + test_phase_increment) % (2 * math.pi)
-            for event in high_value_events:
-                total_resonance += self._harmonic_weight(event.phase, test_phase)
-        
-        return total_resonance / (10 * len(high_value_events))
+        return float(self.sweep_frequencies([test_frequency], steps=10)[0])
     
     def _calculate_stability_score(self) -> float:
         """Calculate overall system stability metric"""
@@ -349,11 +3908,291 @@ class SpiralBuffer:
         
         coherence_stability = 1.0 - np.std(recent_coherence)
         entropy_stability = 1.0 / (1.0 + np.mean(recent_entropy))
-        moral_value_avg = np.mean([e.moral_value for e in self.events])
+        self._settle_all()
+        moral_value_avg = self._aggregates.means()[0]
         
         return (coherence_stability + entropy_stability + moral_value_avg) / 3.0
 
 
+class RWLock:
+    """
+    Readers-writer lock
+    
+    Any number of readers may hold the lock at once; a writer holds it
+    alone. Waiting writers hold back new readers so they are not starved.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+    
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+    
+    def acquire_write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+    
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class ConcurrentSpiralBuffer(SpiralBuffer):
+    """
+    SpiralBuffer that can be shared between threads
+    
+    The phase circle is split into lock stripes, each a run of PhaseIndex
+    sectors guarded by a readers-writer lock that covers the rows whose
+    phase falls inside it. Readers take shared locks on just the stripes
+    they scan, so they never block one another, and the numpy kernels they
+    run release the GIL on large arrays.
+    
+    Insertion order and phase advance are inherently sequential, so writers
+    take turns on a mutation lock, but they lock only the stripes whose rows
+    they change: an insert locks the stripe of its phase, an eviction the
+    victim's stripe, stabilization the stripes of its arc, and cycle-end
+    reinforcement visits the stripes one at a time, so readers elsewhere on
+    the circle keep running. Recall ranks under shared locks and then records
+    access under shared locks on the recalled rows' stripes and a small
+    access lock, skipping rows evicted in between, so it does not wait for
+    writers elsewhere on the circle (with a journal attached it waits for
+    the mutation lock, as access records join the journal).
+    
+    Scores assigned directly through MemoryEvent views are not synchronized.
+    Lazy reinforcement is not supported, since settling turns reads into writes.
+    """
+    
+    DEFAULT_STRIPES = 16
+    
+    def __init__(self, *args, stripes: int = None, **kwargs):
+        """
+        Args:
+            *args, **kwargs: SpiralBuffer arguments
+            stripes: Number of lock stripes (capped at the phase index's
+                sector count; defaults to DEFAULT_STRIPES)
+        """
+        self._requested_stripes = stripes or self.DEFAULT_STRIPES
+        self._mutation_lock = threading.RLock()
+        self._access_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+        if self.lazy_reinforcement:
+            raise ValueError("ConcurrentSpiralBuffer does not support lazy_reinforcement")
+    
+    def _make_instrumentation(self) -> Instrumentation:
+        # Parallel recalls record into the same histograms
+        return Instrumentation(concurrent=True)
+    
+    def _attach_store(self, store: EventStore):
+        super()._attach_store(store)
+        index = self._phase_index
+        for built_lazily in (index, self._recall_index):
+            if built_lazily is not None and built_lazily._stale:
+                built_lazily._rebuild()
+        
+        self.n_stripes = min(self._requested_stripes, index.n_sectors)
+        self._stripe_locks = [RWLock() for _ in range(self.n_stripes)]
+        self._stripe_starts = [-(-stripe * index.n_sectors // self.n_stripes) 
+                               for stripe in range(self.n_stripes + 1)]
+        self._held = set()  # Stripes locked exclusively by the mutation lock holder
+    
+    @property
+    def events(self) -> List[MemoryEvent]:
+        """All stored events, oldest first"""
+        with self._shared(range(self.n_stripes)):
+            return super().events
+    
+    def add_event(self, content: Any, coherence: float, entropy: float) -> MemoryEvent:
+        with self._mutation_lock:
+            return super().add_event(content, coherence, entropy)
+    
+    def add_events(self, 
+                   contents: List[Any], 
+                   coherences: List[float], 
+                   entropies: List[float]) -> List[MemoryEvent]:
+        # Batches evict and insert all around the circle
+        with self._mutation_lock, self._exclusive(range(self.n_stripes)):
+            return super().add_events(contents, coherences, entropies)
+    
+    def recall_by_coherence(self, target_coherence: float, top_k: int = 5,
+                            epsilon: float = 0.0) -> List[MemoryEvent]:
+        store = self._store
+        self.expire()
+        with self._shared(range(self.n_stripes)):
+            recalled_rows = self._recall_rows(target_coherence, top_k, epsilon)
+            recalled_seqs = store.seq[recalled_rows]
+        return self._record_recalled(recalled_rows, recalled_seqs)
+    
+    def recall_similar(self, query: Any, top_k: int = 5, n_probe: int = None) -> List[MemoryEvent]:
+        store = self._store
+        self.expire()
+        with self._shared(range(self.n_stripes)):
+            recalled_rows = self._similar_rows(query, top_k, n_probe)
+            recalled_seqs = store.seq[recalled_rows]
+        return self._record_recalled(recalled_rows, recalled_seqs)
+    
+    def _record_recalled(self, rows: np.ndarray, seqs: np.ndarray) -> List[MemoryEvent]:
+        """Record access to recalled rows that still hold the ranked events and view them"""
+        store = self._store
+        stripes = {self._phase_stripe(phase) for phase in store.phase[rows].tolist()}
+        
+        def record():
+            # Evictions lock the victim's stripe exclusively, so this check holds
+            current = store.live[rows] & (store.seq[rows] == seqs)
+            self._record_access(rows[current])
+            return [store.view(row) for row in rows[current].tolist()]
+        
+        if self._journal is not None:
+            # Writers share the journal, so journaled access takes its turn with them
+            with self._mutation_lock, self._shared(stripes):
+                return record()
+        with self._shared(stripes), self._access_lock:
+            return record()
+    
+    def get_phase_neighbors(self, phase: float, radius: float) -> List[MemoryEvent]:
+        store = self._store
+        self.expire()
+        with self._shared(self._arc_stripes(phase, radius)):
+            rows = self._phase_neighbor_rows(phase, radius)
+            return [store.view(row) for row in store.ordered(rows)]
+    
+    def auto_tune_frequency(self, test_frequencies: List[float] = None, steps: int = 10):
+        with self._mutation_lock:
+            return super().auto_tune_frequency(test_frequencies, steps)
+    
+    def sweep_frequencies(self, frequencies, steps=10) -> np.ndarray:
+        with self._shared(range(self.n_stripes)):
+            return super().sweep_frequencies(frequencies, steps)
+    
+    def get_system_metrics(self) -> Dict:
+        with self._mutation_lock:
+            return super().get_system_metrics()
+    
+    def save(self, path: str):
+        with self._mutation_lock:
+            super().save(path)
+    
+    def attach_journal(self, *args, **kwargs) -> Journal:
+        with self._mutation_lock:
+            return super().attach_journal(*args, **kwargs)
+    
+    def flush_journal(self):
+        with self._mutation_lock:
+            super().flush_journal()
+    
+    def detach_journal(self):
+        with self._mutation_lock:
+            super().detach_journal()
+    
+    # Lock striping
+    
+    def _phase_stripe(self, phase: float) -> int:
+        """Stripe covering a phase"""
+        return self._phase_index.sector(phase) * self.n_stripes // self._phase_index.n_sectors
+    
+    def _arc_stripes(self, phase: float, radius: float):
+        """Stripes covering every sector a PhaseIndex query of the arc reads"""
+        index = self._phase_index
+        low = math.floor((phase - radius) / index.width)
+        high = math.floor((phase + radius) / index.width)
+        if high - low + 1 >= index.n_sectors:
+            return range(self.n_stripes)
+        
+        first = (low % index.n_sectors) * self.n_stripes // index.n_sectors
+        last = (high % index.n_sectors) * self.n_stripes // index.n_sectors
+        if low % index.n_sectors <= high % index.n_sectors:
+            return range(first, last + 1)
+        return sorted(set(range(first, self.n_stripes)) | set(range(last + 1)))
+    
+    def _stripe_rows(self, stripe: int) -> np.ndarray:
+        """Rows whose phase falls in a stripe"""
+        sectors = range(self._stripe_starts[stripe], self._stripe_starts[stripe + 1])
+        return np.concatenate([PhaseIndex._EMPTY] + [self._phase_index.sector_rows(sector) for sector in sectors])
+    
+    @contextmanager
+    def _shared(self, stripes):
+        """Hold shared locks on stripes, acquired in ascending order"""
+        stripes = sorted(stripes)
+        for stripe in stripes:
+            self._stripe_locks[stripe].acquire_read()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._stripe_locks[stripe].release_read()
+    
+    @contextmanager
+    def _exclusive(self, stripes):
+        """Hold exclusive locks on stripes; the caller must hold the mutation lock"""
+        acquired = [stripe for stripe in sorted(set(stripes)) if stripe not in self._held]
+        for stripe in acquired:
+            self._stripe_locks[stripe].acquire_write()
+            self._held.add(stripe)
+        try:
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._held.discard(stripe)
+                self._stripe_locks[stripe].release_write()
+    
+    # Striped mutation steps
+    
+    def _store_event(self, content: Any, coherence: float, entropy: float) -> int:
+        with self._exclusive((self._phase_stripe(self.current_phase),)):
+            return super()._store_event(content, coherence, entropy)
+    
+    def expire(self, now: float = None) -> int:
+        # Readers call this first: skip the mutation lock unless a tick is due
+        if self._expiry is None or not self._expiry.due(time.time() if now is None else now):
+            return 0
+        with self._mutation_lock:
+            return super().expire(now)
+    
+    def _expire_due(self, now: float = None) -> int:
+        # Expiries land anywhere on the circle, but come at most once a tick
+        if self._expiry is None or not self._expiry.due(time.time() if now is None else now):
+            return 0
+        with self._mutation_lock, self._exclusive(range(self.n_stripes)):
+            return super()._expire_due(now)
+    
+    def _merge_duplicate(self, row: int, coherence: float, entropy: float, timestamp: float):
+        with self._exclusive((self._phase_stripe(self._store.phase[row]),)):
+            super()._merge_duplicate(row, coherence, entropy, timestamp)
+    
+    def _evict_lowest(self):
+        victim = self._eviction_heap.peek()
+        with self._exclusive((self._phase_stripe(self._store.phase[victim]),)):
+            super()._evict_lowest()
+    
+    def _check_coherence(self, phase: float):
+        with self._exclusive(self._arc_stripes(phase, self.monitor.STABILIZATION_RADIUS)):
+            super()._check_coherence(phase)
+    
+    def _reinforce_coherent_memories(self, phase: float = None):
+        """Echo high-coherence memories forward in time, one stripe at a time"""
+        if phase is None:
+            phase = self.current_phase
+        for stripe in range(self.n_stripes):
+            with self._exclusive((stripe,)):
+                self._apply_reinforcement(self._stripe_rows(stripe), phase)
+
+
 # Convenience functions for common use cases
 
 def create_buffer(capacity: int = 1000) -> SpiralBuffer:
@@ -11,7 +11,7 @@ import time
 import numpy as np
 from typing import List, Tuple, Dict
 from dataclasses import dataclass
-from spiral_buffer import SpiralBuffer
+from spiral_buffer import ConcurrentSpiralBuffer
 
 
 @dataclass
@@ -82,8 +82,8 @@ class RedditCoherenceAnalyzer:
             'seething': 0.4, 'triggered': 0.3, 'rent free': 0.3
         }
         
-        # Initialize spiral buffer for coherent memory
-        self.memory_buffer = SpiralBuffer(max_capacity=500)
+        # Initialize spiral buffer for coherent memory (shared by webapp request threads)
+        self.memory_buffer = ConcurrentSpiralBuffer(max_capacity=500)
     
     def score_comment_coherence(self, comment_text: str) -> Tuple[float, float]:
         """Score a comment for coherence (ζ) vs entropy (S)"""